@@ -145,10 +145,12 @@ while True:
             state_sample = np.array([state_history[i] for i in indices])
             state_next_sample = np.array(
                 [state_next_history[i] for i in indices])
-            rewards_sample = [rewards_history[i] for i in indices]
-            action_sample = [action_history[i] for i in indices]
+            rewards_sample = np.array([rewards_history[i] for i in indices],
+                                      dtype=np.float32)
+            action_sample = np.array([action_history[i] for i in indices],
+                                     dtype=np.int64)
             done_sample = keras.ops.convert_to_tensor(
-                [float(done_history[i]) for i in indices])
+                np.array([done_history[i] for i in indices], dtype=np.float32))
 
             # Build the updated Q-values for the sampled future states
             # Use the target model for stability
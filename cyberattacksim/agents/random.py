@@ -1,3 +1,6 @@
+from gymnasium import spaces
+
+
 class RandomAgent(object):
     """A simple implementation of a Random Agent capable of randomly acting
     within anOpenAI Gym environment.
@@ -6,13 +9,40 @@ class RandomAgent(object):
     online that use different terminology for the same thing.*
     """
 
-    def __init__(self, action_space):
+    def __init__(self, action_space, batch_size: int = 1000):
         self.action_space = action_space
+        # discrete actions are drawn from the space's rng in batches of
+        # batch_size rather than one rng call per step
+        self.batch_size = batch_size
+        self._sampled_actions = []
+        # the rng the buffered actions were drawn from, seeding the space
+        # replaces it
+        self._sampled_rng = None
+
+    def seed(self, seed=None):
+        """Seed the action space and drop the actions drawn before."""
+        self._sampled_actions = []
+        return self.action_space.seed(seed)
+
+    def _sample(self):
+        if not isinstance(self.action_space, spaces.Discrete):
+            return self.action_space.sample()
+        if self.action_space.np_random is not self._sampled_rng:
+            # the space was re-seeded, the buffered actions are stale
+            self._sampled_actions = []
+            self._sampled_rng = self.action_space.np_random
+        if not self._sampled_actions:
+            actions = self.action_space.start + \
+                self.action_space.np_random.integers(
+                    self.action_space.n, size=self.batch_size)
+            # reversed, so popping from the end returns them in draw order
+            self._sampled_actions = actions[::-1].tolist()
+        return self._sampled_actions.pop()
 
     def act(self, observation, reward, done):
         """Randomly sample an action from the action space."""
-        return self.action_space.sample()
+        return self._sample()
 
     def predict(self, observation, reward, done):
         """Randomly sample an action from the action space."""
-        return self.action_space.sample()
+        return self._sample()
@@ -10,13 +10,15 @@ from __future__ import annotations
 
 import os.path
 from abc import ABC
+from contextlib import contextmanager
 from datetime import datetime
 from logging import getLogger
 from pathlib import Path
-from typing import Final, List, Mapping, Optional, Union
+from typing import Final, Iterator, List, Mapping, Optional, Union
 
 from tabulate import tabulate
-from tinydb import TinyDB
+from tinydb import JSONStorage, TinyDB
+from tinydb.middlewares import CachingMiddleware
 from tinydb.queries import QueryInstance
 from tinydb.table import Document
 
@@ -59,6 +61,32 @@ class CyberAttackDB:
         """Close the db."""
         self.db.close()
 
+    @contextmanager
+    def batch(self) -> Iterator[CyberAttackDB]:
+        """Buffer all writes made within the block in memory and write the
+        .json file once on exit.
+
+        The db is reopened behind a
+        :class:`~tinydb.middlewares.CachingMiddleware` for the duration of the
+        block, so reads within it still see the buffered writes.
+
+        .. code:: python
+
+            >>> with db.batch():
+            ...     db.upsert(doc_a, uuid_a)
+            ...     db.upsert(doc_b, uuid_b)
+        """
+        self.db.close()
+        storage = CachingMiddleware(JSONStorage)
+        storage.WRITE_CACHE_SIZE = float('inf')
+        self._db = TinyDB(self._path, storage=storage)
+        try:
+            yield self
+        finally:
+            # closing the middleware flushes the buffered writes
+            self.db.close()
+            self._db = TinyDB(self._path)
+
     def _db_file_exist(self) -> bool:
         """Check whether the :class:`~tinydb.database.TinyDB` .json file
         exists.
@@ -5,22 +5,45 @@ Serves a similar function to library helpers such as Stable Baselines 3
 ``evaluate_policy()".
 """
 
+import functools
+import logging
 import os
-import re
 from datetime import datetime
 from pathlib import Path
 from threading import Thread
-from typing import Any, List, Optional
+from typing import Any, Callable, List, Optional, Union
 from uuid import uuid4
 
 import imageio
 import matplotlib.pyplot as plt
-import moviepy.editor as mp
+import numpy as np
 import pandas as pd
+import torch
+from gymnasium import spaces
+from PIL import Image
+from stable_baselines3.common.on_policy_algorithm import OnPolicyAlgorithm
+from stable_baselines3.common.vec_env import VecEnv
 
-from cyberattacksim import APP_IMAGES_DIR, IMAGES_DIR, VIDEOS_DIR
+from cyberattacksim import IMAGES_DIR, VIDEOS_DIR
 from cyberattacksim.envs.generic.generic_env import GenericNetworkEnv
 
+logger = logging.getLogger(__name__)
+
+
+def _with_compiled_policy(loop_method: Callable) -> Callable:
+    """Compile the agent's policy for the duration of an action loop and
+    restore the original policy once the loop ends."""
+
+    @functools.wraps(loop_method)
+    def wrapper(self: 'ActionLoop', *args, **kwargs):
+        self._compile_policy()
+        try:
+            return loop_method(self, *args, **kwargs)
+        finally:
+            self._restore_policy()
+
+    return wrapper
+
 
 class ActionLoop:
     """A class that represents different post-training action loops for
@@ -28,24 +51,133 @@ class ActionLoop:
 
     def __init__(
         self,
-        env: GenericNetworkEnv,
+        env: Union[GenericNetworkEnv, VecEnv],
         agent: Any,
         filename: Optional[str] = None,
         episode_count: Optional[int] = None,
+        compile_policy: bool = False,
     ) -> None:
         """Initialize the ActionLoop class.
 
         Args:
-            env: The environment to run through.
+            env: The environment to run through. ``standard_action_loop``
+                also accepts a vectorized environment.
             agent: The agent to run in the environment.
             filename: The save name for the action loop.
             episode_count: The number of episodes to go through.
+            compile_policy: Compile the prediction of an SB3 agent's policy
+                with ``torch.compile`` while a loop runs. Default is False.
         """
-        self.env: GenericNetworkEnv = env
+        self.env: Union[GenericNetworkEnv, VecEnv] = env
         self.agent = agent
         self.filename = filename if filename is not None else str(uuid4())
         self.episode_count = episode_count
+        self.compile_policy = compile_policy
+        # the policy whose _predict is replaced while a loop runs, with its
+        # own _predict attribute (if any) to restore afterwards
+        self._compiled_policy: Optional[torch.nn.Module] = None
+        self._original_predict: Optional[Callable] = None
+        self._compile_failed = False
+
+        # observation buffer reused by every prediction of an on-policy SB3
+        # agent in a single, non-vectorized env. GenericNetworkEnv returns
+        # flat float32 observations, matching the policies' float32 weights
+        self._obs_buf: Optional[torch.Tensor] = None
+        if isinstance(self.agent, OnPolicyAlgorithm) and isinstance(
+                self.env.observation_space,
+                spaces.Box) and not isinstance(self.env, VecEnv):
+            self._obs_buf = torch.empty(self.env.observation_space.shape,
+                                        dtype=torch.float32,
+                                        pin_memory=torch.cuda.is_available())
+
+    def _compile_policy(self) -> None:
+        """Replace the SB3 policy's ``_predict`` with a compiled version.
+
+        The agent is left as is if ``compile_policy`` is off, it has no torch
+        policy, ``torch.compile`` is not available or compiling it failed
+        before. ``torch.compile`` is lazy, so a compilation error is raised
+        by the first prediction, which then falls back to the original
+        ``_predict``.
+        """
+        policy = getattr(self.agent, 'policy', None)
+        if (not self.compile_policy or self._compile_failed
+                or self._compiled_policy is not None
+                or not isinstance(policy, torch.nn.Module)
+                or not hasattr(torch, 'compile')):
+            return
+        original_predict = policy._predict
+        compiled_predict = torch.compile(original_predict,
+                                         mode='reduce-overhead')
+
+        def predict_or_fall_back(*args, **kwargs):
+            try:
+                actions = compiled_predict(*args, **kwargs)
+            except Exception:
+                logger.exception('Compiling the policy failed, falling back '
+                                 'to the uncompiled policy')
+                self._compile_failed = True
+                self._restore_policy()
+                return original_predict(*args, **kwargs)
+            # compiled fine, later predictions skip this check
+            policy._predict = compiled_predict
+            return actions
+
+        self._compiled_policy = policy
+        self._original_predict = vars(policy).get('_predict')
+        # only the bound method is replaced, the saved state_dict keys of the
+        # policy stay unchanged
+        policy._predict = predict_or_fall_back
+
+    def _restore_policy(self) -> None:
+        """Restore the ``_predict`` replaced by :meth:`_compile_policy`."""
+        policy = self._compiled_policy
+        if policy is None:
+            return
+        if self._original_predict is None:
+            del policy._predict
+        else:
+            policy._predict = self._original_predict
+        self._compiled_policy = None
+        self._original_predict = None
+
+    def _predict(self, obs: Any, deterministic: bool = False) -> Any:
+        """Predict the agent's action for a single observation.
+
+        For on-policy SB3 agents the observation is copied into a reused
+        tensor and passed to the policy directly, skipping the allocations
+        of ``agent.predict``. Other agents go through ``agent.predict``.
+
+        Args:
+            obs: The observation of the environment.
+            deterministic: Toggle if the agent's actions should be deterministic. Default is False.
 
+        Returns:
+            The action to take.
+        """
+        if self._obs_buf is None:
+            action, _states = self.agent.predict(obs,
+                                                 deterministic=deterministic)
+            return action
+
+        policy = self.agent.policy
+        self._obs_buf.copy_(torch.from_numpy(np.asarray(obs,
+                                                        dtype=np.float32)))
+        policy.set_training_mode(False)
+        obs_tensor = self._obs_buf.unsqueeze(0).to(policy.device,
+                                                   non_blocking=True)
+        with torch.no_grad():
+            actions = policy._predict(obs_tensor, deterministic=deterministic)
+        action = actions.cpu().numpy().reshape(policy.action_space.shape)
+        # same post-processing of continuous actions as agent.predict
+        if isinstance(policy.action_space, spaces.Box):
+            if policy.squash_output:
+                action = policy.unscale_action(action)
+            else:
+                action = np.clip(action, policy.action_space.low,
+                                 policy.action_space.high)
+        return action
+
+    @_with_compiled_policy
     def gif_action_loop(
         self,
         render_network: bool = True,
@@ -72,57 +204,68 @@ class ActionLoop:
         Returns:
             A list of DataFrames containing the results of each episode.
         """
-        gif_uuid = str(uuid4())
-
         complete_results = []
+        render_threads = []
         for i in range(self.episode_count):
             # temporary log to satisfy repeatability tests until logging can be full implemented
-            results = pd.DataFrame(columns=['action', 'rewards', 'info'])
+            # the rows are collected per step and turned into a DataFrame
+            # once the episode is over
+            rows = []
             obs, _ = self.env.reset()
             done = False
-            frame_names = []
-            current_image = 0
+            frames = []
+
+            # get current time
+            string_time = datetime.now().strftime('%Y-%m-%d-%H-%M-%S')
+
+            video_writer = None
+            if save_webm:
+                if webm_output_directory is None:
+                    webm_output_directory = VIDEOS_DIR
+                if not os.path.exists(webm_output_directory):
+                    os.makedirs(webm_output_directory)
+                webm_path = os.path.join(
+                    webm_output_directory,
+                    f'{self.filename}_{string_time}_{i + 1}.mp4',
+                )
+                # the frames are piped to ffmpeg as they are rendered, so
+                # the video is encoded while the episode is simulated
+                video_writer = self._open_video_writer(webm_path)
 
+            frame_num = 0
             while not done:
                 # gets the agents prediction for the best next action to take
-                action, _states = self.agent.predict(
-                    obs, deterministic=deterministic)
+                action = self._predict(obs, deterministic=deterministic)
                 # TODO: setup logging properly here
                 # logging.info(f'Blue Agent Action: {action}')
                 # step the env
                 obs, rewards, done, truncated, info = self.env.step(action)
-                results.loc[len(results.index)] = [action, rewards, info]
+                rows.append((action, rewards, info))
                 # TODO: setup logging properly here
                 # logging.info(f'Observations: {obs.flatten()} Rewards:{rewards} Done:{done}')
                 # self.env.render(episode=i+1)
 
                 if save_gif or save_webm:
-                    current_name = os.path.join(
-                        APP_IMAGES_DIR, f'{gif_uuid}_{current_image}.png')
-                    current_image += 1
-
-                    # set the size of the gif image
-                    self._get_render_figure(current_name)
-
-                    frame_names.append(current_name)
+                    # grab the current figure as an RGB array
+                    frame = self._grab_frame_rgb()
+                    if save_gif:
+                        frames.append(frame)
+                    # skip first frame because it is empty
+                    if video_writer is not None and frame_num > 0:
+                        video_writer.append_data(frame)
+                    frame_num += 1
 
                 if render_network:
                     self.env.render(*args, **kwargs)
 
-            # get current time
-            string_time = datetime.now().strftime('%Y-%m-%d-%H-%M-%S')
-
-            generate_render_thread = []
-
-            def natural_sort_key(
-                s: str, _nsre=re.compile('([0-9]+)')) -> List[Any]:
-                return [
-                    int(text) if text.isdigit() else text.lower()
-                    for text in _nsre.split(s)
-                ]
+            if video_writer is not None:
+                video_writer.close()
 
-            frame_names = sorted(frame_names, key=natural_sort_key)
+            results = pd.DataFrame.from_records(
+                rows, columns=['action', 'rewards', 'info'])
 
+            # the GIF is encoded on a background thread while the next
+            # episode is simulated
             if save_gif:
                 if gif_output_directory is None:
                     gif_output_directory = IMAGES_DIR
@@ -130,43 +273,26 @@ class ActionLoop:
                     os.makedirs(gif_output_directory)
                 gif_path = os.path.join(
                     gif_output_directory,
-                    f'{self.filename}_{string_time}_{self.episode_count}.gif',
+                    f'{self.filename}_{string_time}_{i + 1}.gif',
                 )
 
                 # gif generator thread
                 gif_thread = Thread(target=self.generate_gif,
-                                    args=(gif_path, frame_names))
-
-                generate_render_thread.append(gif_thread)
-
-            if save_webm:
-                if webm_output_directory is None:
-                    webm_output_directory = VIDEOS_DIR
-                if not os.path.exists(webm_output_directory):
-                    os.makedirs(webm_output_directory)
-                webm_path = os.path.join(
-                    webm_output_directory,
-                    f'{self.filename}_{string_time}_{self.episode_count}.mp4',
-                )
-
-                # video generator thread
-                video_thread = Thread(target=self.generate_webm,
-                                      args=(webm_path, frame_names))
-                generate_render_thread.append(video_thread)
-            # if any threads were added to generate threads list, run them
-            if generate_render_thread:
-                for thread in generate_render_thread:
-                    thread.start()
-                    thread.join()
-                # clean up once done
-                self.render_cleanup(frame_names)
+                                    args=(gif_path, frames))
+                gif_thread.start()
+                render_threads.append(gif_thread)
 
             complete_results.append(results)
 
+        # wait for the encoding of the last episodes to finish
+        for render_thread in render_threads:
+            render_thread.join()
+
         if not prompt_to_close:
             self.env.close()
         return complete_results
 
+    @_with_compiled_policy
     def standard_action_loop(self,
                              deterministic: bool = False
                              ) -> List[pd.DataFrame]:
@@ -178,22 +304,60 @@ class ActionLoop:
         Returns:
             A list of DataFrames containing the results of each episode.
         """
+        if isinstance(self.env, VecEnv):
+            return self._vec_standard_action_loop(deterministic)
+
         complete_results = []
         for i in range(self.episode_count):
             # temporary log to satisfy repeatability tests until logging can be full implemented
-            results = pd.DataFrame(columns=['action', 'rewards', 'info'])
+            # the rows are collected per step and turned into a DataFrame
+            # once the episode is over
+            rows = []
             obs, _ = self.env.reset()
             done = False
             while not done:
-                action, _states = self.agent.predict(
-                    obs, deterministic=deterministic)
+                action = self._predict(obs, deterministic=deterministic)
                 # TODO: setup logging properly here
                 # logging.info(f'Blue Agent Action: {action}')
                 obs, rewards, done, truncated, info = self.env.step(action)
-                results.loc[len(results.index)] = [action, rewards, info]
+                rows.append((action, rewards, info))
+            results = pd.DataFrame.from_records(
+                rows, columns=['action', 'rewards', 'info'])
             complete_results.append(results)
         return complete_results
 
+    def _vec_standard_action_loop(self,
+                                  deterministic: bool = False
+                                  ) -> List[pd.DataFrame]:
+        """Act within all the environments of a vectorized environment at
+        once, so that a single agent prediction covers every environment.
+
+        Args:
+            deterministic: Toggle if the agent's actions should be deterministic. Default is False.
+
+        Returns:
+            A list of DataFrames containing the results of each episode, in
+            the order the episodes finished.
+        """
+        complete_results = []
+        rows = [[] for _ in range(self.env.num_envs)]
+        obs = self.env.reset()
+        while len(complete_results) < self.episode_count:
+            actions, _states = self.agent.predict(obs,
+                                                  deterministic=deterministic)
+            # the envs reset themselves at the end of an episode
+            obs, rewards, dones, infos = self.env.step(actions)
+            for env_idx, done in enumerate(dones):
+                rows[env_idx].append(
+                    (actions[env_idx], rewards[env_idx], infos[env_idx]))
+                if done:
+                    complete_results.append(
+                        pd.DataFrame.from_records(
+                            rows[env_idx],
+                            columns=['action', 'rewards', 'info']))
+                    rows[env_idx] = []
+        return complete_results[:self.episode_count]
+
     def random_action_loop(self, deterministic: bool = False) -> None:
         """Indefinitely act within the environment taking random actions.
 
@@ -213,67 +377,68 @@ class ActionLoop:
                 if done:
                     break
 
-    @classmethod
-    def _get_render_figure(cls, gif_name: str) -> Any:
-        """Save the current plot figure as an image.
-
-        Args:
-            gif_name: The filename for the image.
+    def _grab_frame_rgb(self) -> np.ndarray:
+        """Draw the env's plot figure and copy it into an RGB array.
 
         Returns:
-            The current figure.
+            The figure as a (height, width, 3) uint8 array.
         """
-        fig = plt.gcf()
-        # save the current image
-        plt.savefig(gif_name, bbox_inches='tight', dpi=100)
-        return fig
-
-    def generate_gif(self, gif_path: str, frame_names: List[str]) -> None:
+        # the env's graph plotter owns one figure that it redraws each step
+        graph_plotter = getattr(self.env, 'graph_plotter', None)
+        fig = graph_plotter.fig if graph_plotter is not None else plt.gcf()
+        fig.canvas.draw()
+        return np.asarray(fig.canvas.buffer_rgba())[..., :3].copy()
+
+    def generate_gif(self,
+                     gif_path: str,
+                     frames: List[np.ndarray],
+                     frame_duration: int = 100,
+                     palette_size: int = 64) -> None:
         """Generate GIF from images.
 
         Args:
             gif_path: The path where the generated GIF will be saved.
-            frame_names: A list of file paths to the images that will be used as frames in the GIF.
+            frames: The RGB images that will be used as frames in the GIF.
+            frame_duration: How long each frame is shown, in milliseconds. Default is 100.
+            palette_size: The number of colours of each frame's palette. Default is 64.
         """
-        # TODO: Full docstring.
-        with imageio.get_writer(gif_path, mode='I') as writer:
-            # create a gif from the images
-            for frame_num, filename in enumerate(frame_names):
-                # skip first frame because it is empty
-                if filename == frame_names[0]:
-                    continue
-                # read image
-                image = imageio.imread(filename)
-                # add image to GIF
-                writer.append_data(image)
-
-                # if the last frame, add more of it so the result can be seen longer
-                if frame_num == len(frame_names) - 1:
-                    for _ in range(10):
-                        writer.append_data(image)
-
-    def generate_webm(self,
-                      webm_path: str,
-                      frame_names: List[str],
-                      fps: int = 1) -> None:
-        """Create a WebM video from a sequence of image files.
+        # skip first frame because it is empty, every frame is quantized once
+        # with the fast octree method (2)
+        images = [
+            Image.fromarray(image).quantize(colors=palette_size, method=2)
+            for image in frames[1:]
+        ]
+        if not images:
+            return
+        # show the last frame longer so the result can be seen longer,
+        # rather than encoding it again 10 more times
+        durations = [frame_duration] * len(images)
+        durations[-1] = frame_duration * 11
+        images[0].save(gif_path,
+                       save_all=True,
+                       append_images=images[1:],
+                       duration=durations,
+                       loop=0)
 
-        Args:
-            webm_path: The path where the generated WebM file will be saved.
-            frame_names: A list of file paths to the images that will be used as frames in the video.
-            fps: Frames per second for the video. Default is 5.
-        """
-        # Create a video clip from the image sequence
-        clip = mp.ImageSequenceClip(frame_names[1:], fps=fps)
-
-        # Write the video clip to a WebM file
-        clip.write_videofile(webm_path, codec='mpeg4')
-
-    def render_cleanup(self, frame_names: List[str]) -> None:
-        """Delete the frame image files.
+    @classmethod
+    def _open_video_writer(cls, webm_path: str, fps: int = 1) -> Any:
+        """Open an ffmpeg pipe that encodes appended frames with libx264.
 
         Args:
-            frame_names: A list of file paths to the images that were used as frames.
+            webm_path: The path where the video will be saved.
+            fps: Frames per second for the video. Default is 1.
+
+        Returns:
+            An imageio writer, frames are added with ``append_data``.
         """
-        for filename in set(frame_names):
-            os.remove(filename)
+        # yuv420p needs even frame sizes, macro_block_size=2 pads to them
+        return imageio.get_writer(
+            webm_path,
+            format='FFMPEG',
+            mode='I',
+            fps=fps,
+            codec='libx264',
+            pixelformat='yuv420p',
+            macro_block_size=2,
+            ffmpeg_params=['-preset', 'veryfast'],
+        )
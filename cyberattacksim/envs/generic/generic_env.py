@@ -5,7 +5,6 @@ such as how the red agent behaves, what the red team and blue team objectives
 are, the size and topology of the network being defended and what data should
 be collected during the simulation.
 """
-import random
 import copy
 import json
 import random
@@ -94,8 +93,7 @@ class GenericNetworkEnv(gym.Env):
         self.collect_data = collect_additional_per_ts_data
         self.env_observation = self.network_interface.get_current_observation()
         self.state_dim = (self.network_interface.get_observation_size(), )
-        self.action_dim  = self.action_space.n
-
+        self.action_dim = self.action_space.n
 
     def seed(self, seed: int = None):
         """
@@ -110,11 +108,10 @@ class GenericNetworkEnv(gym.Env):
         # 如果提供了种子，则设置 NumPy 和 random 模块的种子
         self.np_random = np.random.RandomState(seed)
         random.seed(seed)
-        
+
         # 返回使用的种子，通常用于确认种子设置成功
         return [seed]
 
-
     def reset(self, seed: int = 0) -> np.array:
         """Reset the environment to the default state.
 
@@ -312,9 +309,10 @@ class GenericNetworkEnv(gym.Env):
                 self.network_interface.game_mode.rewards.function.value,
             )(reward_args)
 
-            # gets the current observation from the environment
+            # gets the current observation from the environment, it is
+            # already a flat float32 array so it is used without a copy
             self.env_observation = (
-                self.network_interface.get_current_observation().flatten())
+                self.network_interface.get_current_observation())
             self.current_duration += 1
 
             # if the total number of steps reaches the set end then the blue agent wins and is rewarded accordingly
@@ -445,6 +443,12 @@ class GenericNetworkEnv(gym.Env):
             show_node_names=show_node_names,
         )
 
+    def close(self):
+        """Close the render window, if one was opened."""
+        if self.graph_plotter is not None:
+            self.graph_plotter.close()
+            self.graph_plotter = None
+
     def calculate_observation_space_size(self, with_feather: bool) -> int:
         """Calculate the observation space size.
 
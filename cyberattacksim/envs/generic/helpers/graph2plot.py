@@ -3,6 +3,7 @@ import statistics
 from typing import Dict, List
 
 import matplotlib.pyplot as plt
+from matplotlib.collections import LineCollection
 from matplotlib.lines import Line2D
 
 from cyberattacksim.networks.network import Network
@@ -97,7 +98,10 @@ class CustomEnvGraph:
             show_only_blue_view: If true only shows what the blue agent can see
             show_node_names: Show the names of nodes
         """
-        self.vis_ax.clear()
+        # everything is drawn straight onto the axes the plotter owns, which
+        # are cleared and reused for every frame
+        ax = self.vis_ax
+        ax.clear()
 
         special_node_info = {
             'high_value_node': {
@@ -173,7 +177,7 @@ class CustomEnvGraph:
                     markersize=15,
                 ))
             # plots the target node
-            plt.scatter(
+            ax.scatter(
                 [target_node.x_pos],
                 [target_node.y_pos],
                 color='#2c195e',
@@ -258,14 +262,14 @@ class CustomEnvGraph:
                     label='Entry Node',
                     markersize=12,
                 ))
-        # plots all of the edges in the graph
-        for edge in g.edges:
-            plt.plot(
-                [edge[0].x_pos, edge[1].x_pos],
-                [edge[0].y_pos, edge[1].y_pos],
-                color='grey',
+        # plots all of the edges in the graph as a single artist
+        ax.add_collection(
+            LineCollection(
+                [[(edge[0].x_pos, edge[0].y_pos),
+                  (edge[1].x_pos, edge[1].y_pos)] for edge in g.edges],
+                colors='grey',
                 zorder=1,
-            )
+            ))
 
         # plots all of the current turns attacks
         red_nodes_x = []
@@ -274,7 +278,7 @@ class CustomEnvGraph:
             red_nodes_x.append(node_set[1].x_pos)
             red_nodes_y.append(node_set[1].y_pos)
             if node_set[0] is not None:
-                plt.plot(
+                ax.plot(
                     [node_set[0].x_pos, node_set[1].x_pos],
                     [node_set[0].y_pos, node_set[1].y_pos],
                     color='red',
@@ -359,37 +363,29 @@ class CustomEnvGraph:
                 void_y.append(n.y_pos)
 
         # plots any nodes that have no features
-        plt.scatter(void_x, void_y, color='grey', s=300, zorder=1)
+        ax.scatter(void_x, void_y, color='grey', s=300, zorder=1)
 
         # plots all of the compromised nodes
-        plt.scatter(comp_x, comp_y, color='orange', s=324, zorder=8)
+        ax.scatter(comp_x, comp_y, color='orange', s=324, zorder=8)
         # plot the circles around unknown compromised nodes
-        plt.scatter(unknown_comp_x,
-                    unknown_comp_y,
-                    color='red',
-                    s=484,
-                    zorder=7)
+        ax.scatter(unknown_comp_x,
+                   unknown_comp_y,
+                   color='red',
+                   s=484,
+                   zorder=7)
         # plot the circles around known compromised nodes
-        plt.scatter(known_comp_x, known_comp_y, color='blue', s=484, zorder=7)
+        ax.scatter(known_comp_x, known_comp_y, color='blue', s=484, zorder=7)
         # plots all of the safe nodes
-        plt.scatter(safe_x, safe_y, color=safe_colours, s=324, zorder=5)
+        ax.scatter(safe_x, safe_y, color=safe_colours, s=324, zorder=5)
         # plots all of the recently taken red nodes
-        plt.scatter(red_nodes_x, red_nodes_y, color='red', s=324, zorder=9)
+        ax.scatter(red_nodes_x, red_nodes_y, color='red', s=324, zorder=9)
         # plots all of the nodes that have just been patched
-        plt.scatter(made_safe_x,
-                    made_safe_y,
-                    color='#4ef2e7',
-                    s=324,
-                    zorder=10)
+        ax.scatter(made_safe_x, made_safe_y, color='#4ef2e7', s=324, zorder=10)
         # plots any special nodes for the env
-        plt.scatter(special_x,
-                    special_y,
-                    color=special_colour,
-                    s=324,
-                    zorder=6)
+        ax.scatter(special_x, special_y, color=special_colour, s=324, zorder=6)
         # plot the entrance nodes
         for node in g.entry_nodes:
-            plt.scatter(
+            ax.scatter(
                 [node.x_pos],
                 [node.y_pos],
                 color='black',
@@ -399,7 +395,7 @@ class CustomEnvGraph:
             )
         if show_node_names:
             for node in g.nodes:
-                plt.text(
+                ax.text(
                     node.x_pos + 0.1,
                     node.y_pos + 0.1,
                     node,
@@ -418,7 +414,6 @@ class CustomEnvGraph:
                 round(
                     statistics.mean([n.vulnerability_score
                                      for n in g.nodes]), 2)))
-        ax = plt.gca()
         ax.legend(
             handles=legend_objects,
             loc='center left',
@@ -435,12 +430,12 @@ class CustomEnvGraph:
 
         ax.set_xlabel(info)
         for pos in ['left', 'right', 'top', 'bottom']:
-            plt.gca().spines[pos].set_visible(False)
+            ax.spines[pos].set_visible(False)
 
         # plt.show()
         # invert y axis - computer coords to cartesian conversion
-        plt.gca().invert_yaxis()
+        ax.invert_yaxis()
 
     def close(self):
         """Close all handles to external renderers."""
-        plt.close()
+        plt.close(self.fig)
@@ -63,8 +63,8 @@ class GraphExplore(gym.Env):
         self.reward_range = (-1 * (self.NODES * self.NODES),
                              self.NODES * self.NODES)
 
-        # start blue
-        self.INITIAL_BLUE = random.choice(list(self.G.nodes()))
+        # start blue, all generated graphs label their nodes 0..n-1
+        self.INITIAL_BLUE = random.randrange(self.NODES)
         self.POS_BLUE = self.INITIAL_BLUE
 
         # blue visit list
@@ -149,9 +149,9 @@ class GraphExplore(gym.Env):
         # Reset the state of the environment to an initial state
         print('GAME RESET')
         self.CURRENT_STEP = 0
-        self.G = nx.path_graph(n=self.NODES)
+        # the graph is static, only the blue start node is re-drawn
         self.pos = None
-        self.INITIAL_BLUE = random.choice(list(self.G.nodes()))
+        self.INITIAL_BLUE = random.randrange(self.NODES)
         self.POS_BLUE = self.INITIAL_BLUE
         self.CURRENT_STEP = 0
         self.BLUE_SCORE = 0
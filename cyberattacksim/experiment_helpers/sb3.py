@@ -1,13 +1,22 @@
+import io
 import logging
+import os
+import queue
+import time
+from functools import partial
 from statistics import mean
-
+from threading import Thread
+from typing import Callable, Optional
 
 import gymnasium as gym
 from scipy.stats import describe, iqr
 from stable_baselines3 import A2C, DQN, PPO
 from stable_baselines3.a2c import MlpPolicy as A2CMlp
+from stable_baselines3.common.callbacks import BaseCallback
 from stable_baselines3.common.evaluation import evaluate_policy
 from stable_baselines3.common.monitor import Monitor
+from stable_baselines3.common.vec_env import (DummyVecEnv, SubprocVecEnv,
+                                              VecEnv, VecMonitor)
 from stable_baselines3.dqn import MlpPolicy as DQNMlp
 from stable_baselines3.ppo import MlpPolicy as PPOMlp
 from tabulate import tabulate
@@ -16,6 +25,11 @@ from cyberattacksim.agents.random import RandomAgent
 
 logger = logging.getLogger(__name__)
 
+VEC_ENV_BACKENDS = {'dummy': DummyVecEnv, 'subproc': SubprocVecEnv}
+
+# envs stepping faster than this (in seconds) are not worth a worker process
+AUTO_BACKEND_MAX_DUMMY_STEP_TIME = 200e-6
+
 
 def init_env(env: str, experiment_id: str):
     """Use the Stable Baselines 3 Monitor wrappper to wrap an environment in
@@ -35,6 +49,193 @@ def init_env(env: str, experiment_id: str):
     return wrapped_env
 
 
+def _pinned_env_fn(env_fn: Callable[[], gym.Env], rank: int) -> gym.Env:
+    """Pin the calling worker process to one of the available CPUs, chosen by
+    its rank, then build its environment."""
+    if hasattr(os, 'sched_setaffinity'):
+        cpus = sorted(os.sched_getaffinity(0))
+        os.sched_setaffinity(0, {cpus[rank % len(cpus)]})
+    return env_fn()
+
+
+def measure_step_time(env_fn: Callable[[], gym.Env],
+                      n_steps: int = 200) -> float:
+    """Measure the mean time of a random step of an environment.
+
+    Args:
+        env_fn: a callable that builds one environment
+        n_steps: the number of random steps to time (int)
+
+    Returns:
+        The mean step time in seconds (float)
+    """
+    env = env_fn()
+    try:
+        env.reset()
+        start = time.perf_counter()
+        for _ in range(n_steps):
+            _, _, terminated, truncated, _ = env.step(
+                env.action_space.sample())
+            if terminated or truncated:
+                env.reset()
+        return (time.perf_counter() - start) / n_steps
+    finally:
+        env.close()
+
+
+def resolve_vec_backend(env_fn: Callable[[], gym.Env],
+                        backend: Optional[str] = None) -> str:
+    """Resolve the vectorized env backend of :func:`init_vec_env`.
+
+    The ``auto`` backend builds and steps a throwaway env to time it, so
+    callers building several vectorized envs from the same ``env_fn`` should
+    resolve the backend once and pass it on as ``backend``.
+
+    Args:
+        env_fn: a callable that builds one environment
+        backend: ``'auto'``, ``'subproc'`` or ``'dummy'``, defaults to the
+            ``VEC_BACKEND`` environment variable or ``'auto'`` (str)
+
+    Returns:
+        ``'subproc'`` or ``'dummy'`` (str)
+    """
+    backend = backend or os.environ.get('VEC_BACKEND', 'auto')
+    if backend == 'auto':
+        step_time = measure_step_time(env_fn)
+        backend = ('dummy' if step_time < AUTO_BACKEND_MAX_DUMMY_STEP_TIME else
+                   'subproc')
+        logger.info(f'Mean env step time {step_time * 1e6:.0f}us, '
+                    f"using the '{backend}' vectorized env backend")
+    if backend not in VEC_ENV_BACKENDS:
+        raise ValueError(f"Unknown vectorized env backend '{backend}', "
+                         f"choose from {['auto', *VEC_ENV_BACKENDS]}")
+    return backend
+
+
+def init_vec_env(env_fn: Callable[[], gym.Env],
+                 n_envs: int,
+                 monitor_path: Optional[str] = None,
+                 start_method: Optional[str] = None,
+                 pin_workers: bool = False,
+                 backend: Optional[str] = None) -> VecEnv:
+    """Step ``n_envs`` copies of an environment as a single monitored
+    vectorized environment.
+
+    With the ``subproc`` backend every env runs in its own worker process.
+    The ``dummy`` backend steps them one after the other in the calling
+    process, which is faster when a single env step is cheaper than the
+    inter-process communication. The ``auto`` backend times random steps of
+    a throwaway env and picks ``dummy`` for envs that step faster than
+    ``AUTO_BACKEND_MAX_DUMMY_STEP_TIME``, see :func:`resolve_vec_backend`.
+    ``start_method`` and
+    ``pin_workers`` only apply to the ``subproc`` backend and are ignored by
+    the ``dummy`` one.
+
+    Args:
+        env_fn: a picklable callable that builds one environment
+        n_envs: the number of environments to run in parallel (int)
+        monitor_path: optional file path for the VecMonitor csv log (str)
+        start_method: the multiprocessing start method of the workers (str)
+        pin_workers: pin each worker process to its own CPU (bool)
+        backend: ``'auto'``, ``'subproc'`` or ``'dummy'``, defaults to the
+            ``VEC_BACKEND`` environment variable or ``'auto'`` (str)
+
+    Returns:
+        A Stable Baselines 3 VecMonitor wrapped SubprocVecEnv or DummyVecEnv
+    """
+    backend = resolve_vec_backend(env_fn, backend)
+    if backend == 'dummy' and (start_method is not None or pin_workers):
+        logger.info('Ignoring start_method and pin_workers, the envs are '
+                    "stepped in-process by the 'dummy' backend")
+
+    if backend == 'dummy':
+        vec_env = DummyVecEnv([env_fn for _ in range(n_envs)])
+    else:
+        if pin_workers:
+            env_fns = [
+                partial(_pinned_env_fn, env_fn, rank) for rank in range(n_envs)
+            ]
+        else:
+            env_fns = [env_fn for _ in range(n_envs)]
+        vec_env = SubprocVecEnv(env_fns, start_method=start_method)
+
+    return VecMonitor(vec_env, filename=monitor_path)
+
+
+class AsyncCheckpointCallback(BaseCallback):
+    """Save the model every ``save_freq`` calls without blocking training on
+    disk IO.
+
+    The model is serialized into an in-memory buffer on the training thread,
+    then a background thread writes the buffers to disk in order.
+
+    Args:
+        save_freq: save the model every ``save_freq`` callback calls (int)
+        save_path: the directory to save the checkpoints to (str)
+        name_prefix: the filename prefix of the checkpoints (str)
+        verbose: the verbosity level (int)
+    """
+
+    def __init__(self,
+                 save_freq: int,
+                 save_path: str,
+                 name_prefix: str = 'rl_model',
+                 verbose: int = 0):
+        super().__init__(verbose)
+        self.save_freq = save_freq
+        self.save_path = save_path
+        self.name_prefix = name_prefix
+        self._queue: queue.Queue = queue.Queue()
+        self._writer: Optional[Thread] = None
+        self._error: Optional[BaseException] = None
+
+    def _init_callback(self) -> None:
+        os.makedirs(self.save_path, exist_ok=True)
+        self._writer = Thread(target=self._write_checkpoints, daemon=True)
+        self._writer.start()
+
+    def _write_checkpoints(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            path, buffer = item
+            try:
+                with open(path, 'wb') as f:
+                    f.write(buffer.getbuffer())
+            except Exception as e:
+                # keep draining the queue, the error is raised on the
+                # training thread
+                logger.exception(f'Failed to save model checkpoint to {path}')
+                if self._error is None:
+                    self._error = e
+                continue
+            if self.verbose >= 2:
+                print(f'Saving model checkpoint to {path}')
+
+    def _raise_writer_error(self) -> None:
+        if self._error is not None:
+            raise self._error
+
+    def _on_step(self) -> bool:
+        self._raise_writer_error()
+        if self.n_calls % self.save_freq == 0:
+            path = os.path.join(
+                self.save_path,
+                f'{self.name_prefix}_{self.num_timesteps}_steps.zip')
+            buffer = io.BytesIO()
+            self.model.save(buffer)
+            self._queue.put((path, buffer))
+        return True
+
+    def _on_training_end(self) -> None:
+        # flush the pending checkpoints before training returns
+        self._queue.put(None)
+        if self._writer is not None:
+            self._writer.join()
+        self._raise_writer_error()
+
+
 def train_and_eval(agent_name: str, environment, training_timesteps: int,
                    n_eval_episodes: int):
     """Train and Evaluate an agent.
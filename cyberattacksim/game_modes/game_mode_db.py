@@ -3,7 +3,9 @@ that defines the game_mode DB fields."""
 
 from __future__ import annotations
 
+import copy
 import os
+from functools import lru_cache
 from logging import getLogger
 from pathlib import Path
 from typing import Final, List, Optional, Union
@@ -365,6 +367,12 @@ def default_game_mode() -> GameMode:
 
     :return: An instance of :class:`~cyberattacksim.game_modes.game_mode.GameMode`.
     """
+    # copy the cached instance, callers mutate the game mode they are given
+    return copy.deepcopy(_load_default_game_mode())
+
+
+@lru_cache(maxsize=None)
+def _load_default_game_mode() -> GameMode:
     with GameModeDB() as db:
         return db.get('900a704f-6271-4994-ade7-40b74d3199b1')
 
@@ -391,6 +391,20 @@ class Network(nx.Graph):
                             f"'{node_str}', and may cause the training to end "
                             f'prematurely.'))
 
+    def _check_intersects(self):
+        """Check all nodes at once that high value nodes and entry nodes do
+        not overlap.
+
+        Equivalent to calling :meth:`_check_intersect` on every node, but
+        computes the overlap a single time.
+        """
+        for node in set(self.entry_nodes) & set(self.high_value_nodes):
+            warnings.warn(
+                UserWarning(
+                    f'Entry nodes and high value nodes intersect at node '
+                    f"'{str(node)}', and may cause the training to end "
+                    f'prematurely.'))
+
     def set_from_dict(
         self,
         config_dict: dict,
@@ -543,37 +557,39 @@ class Network(nx.Graph):
         If no entry nodes supplied then the first node in the network is chosen
         as the initial node.
         """
-        try:
-            node_dict = nx.algorithms.centrality.eigenvector_centrality(
-                self, max_iter=500)
-        except nx.PowerIterationFailedConvergence as e:
-            _LOGGER.debug(e)
-            node_dict = {node: 0.5 for node in self.nodes()}
-        weights = list(node_dict.values())
-        all_nodes = list(node_dict.keys())
-
-        if self.random_entry_node_preference == RandomEntryNodePreference.EDGE:
-            weights = list(map(lambda x: (1 / x)**4, weights))
-        elif self.random_entry_node_preference == RandomEntryNodePreference.CENTRAL:
-            weights = list(map(lambda x: x**4, weights))
-        elif self.random_entry_node_preference == RandomEntryNodePreference.NONE:
+        if self.random_entry_node_preference == RandomEntryNodePreference.NONE:
+            # the weights are uniform, so the centrality is not needed
+            all_nodes = list(self.nodes)
             weights = [1] * len(all_nodes)
-
-        weights_normal = [float(i) / sum(weights) for i in weights]
-
-        entry_nodes = choice(
-            all_nodes,
-            self.num_of_random_entry_nodes,
-            replace=False,
-            p=weights_normal,
-        )
+        else:
+            try:
+                node_dict = nx.algorithms.centrality.eigenvector_centrality(
+                    self, max_iter=500)
+            except nx.PowerIterationFailedConvergence as e:
+                _LOGGER.debug(e)
+                node_dict = {node: 0.5 for node in self.nodes()}
+            weights = list(node_dict.values())
+            all_nodes = list(node_dict.keys())
+
+            if self.random_entry_node_preference == RandomEntryNodePreference.EDGE:
+                weights = list(map(lambda x: (1 / x)**4, weights))
+            elif self.random_entry_node_preference == RandomEntryNodePreference.CENTRAL:
+                weights = list(map(lambda x: x**4, weights))
+
+        total_weight = sum(weights)
+        weights_normal = [float(i) / total_weight for i in weights]
+
+        entry_nodes = set(
+            choice(
+                all_nodes,
+                self.num_of_random_entry_nodes,
+                replace=False,
+                p=weights_normal,
+            ))
 
         for node in self.nodes:
-            if node in entry_nodes:
-                node.entry_node = True
-            else:
-                node.entry_node = False
-            self._check_intersect(node)
+            node.entry_node = node in entry_nodes
+        self._check_intersects()
 
     def reset_random_high_value_nodes(self):
         """Sets up the high value nodes (HVNs) to be used by the training
@@ -623,7 +639,7 @@ class Network(nx.Graph):
             # gets all the paths between nodes
             paths = []
             for n in self.entry_nodes:
-                paths.append(dict(nx.all_pairs_shortest_path_length(self))[n])
+                paths.append(nx.single_source_shortest_path_length(self, n))
             sums = Counter()
             counters = Counter()
             # gets the distances to the entry points
@@ -654,22 +670,24 @@ class Network(nx.Graph):
             )
             warnings.warn(UserWarning(msg))
 
-        high_value_nodes = sample(
-            set(possible_high_value_nodes),
-            number_of_high_value_nodes,
-        )
+        high_value_nodes = set(
+            sample(
+                possible_high_value_nodes,
+                number_of_high_value_nodes,
+            ))
         for node in self.nodes:
-            if node in high_value_nodes:
-                node.high_value_node = True
-            else:
-                node.high_value_node = False
-            self._check_intersect(node)
+            node.high_value_node = node in high_value_nodes
+        self._check_intersects()
 
     def reset_random_vulnerabilities(self):
         """Regenerate random vulnerabilities for every node in the network."""
         if self.set_random_vulnerabilities:
+            # the same draws as _generate_random_vulnerability, with the
+            # bounds looked up once for all nodes
+            lower = self.node_vulnerability_lower_bound
+            scale = self.node_vulnerability_upper_bound - lower
             for node in self.nodes:
-                node.vulnerability = self._generate_random_vulnerability()
+                node.vulnerability = lower + scale * random.random()
 
     def to_dict(self, json_serializable: bool = False) -> Dict[str, Any]:
         """Represent the `Network` as a dictionary."""
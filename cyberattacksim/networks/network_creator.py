@@ -16,7 +16,7 @@ Networks that can be created are:
 import math
 import random
 from itertools import combinations, groupby
-from typing import Any, Dict, List, Union
+from typing import TYPE_CHECKING, Any, Dict, List, Union
 
 import networkx as nx
 import numpy as np
@@ -24,6 +24,9 @@ import numpy as np
 from cyberattacksim.networks.network import Network
 from cyberattacksim.networks.node import Node
 
+if TYPE_CHECKING:
+    import scipy.sparse as sp
+
 
 def check_if_nearby(pos: List[float], full_list: dict, value: int) -> bool:
     """Check if a randomly generated point is close to points already
@@ -108,28 +111,39 @@ def get_network_from_matrix_and_positions(
 
 
 def get_network_from_dict(
-    matrix: np.ndarray,
+    matrix: Union[np.ndarray, 'sp.csr_matrix'],
     positions: Dict[str, List[int]],
     entry_nodes: Union[Dict[str, List[int]], List[str | int]],
 ) -> Network:
+    """Get nodes and edges from a dense or CSR adjacency matrix, a dictionary
+    of positions and the entry nodes.
+
+    :param matrix: A 2D numpy array or scipy CSR adjacency matrix.
+    :param positions: The node positions on a graph.
+    :param entry_nodes: The names of the entry nodes.
+    :return: An instance of :class:`~cyberattacksim.networks.network.Network`.
+    """
     network = Network()
-    edges = []
     # Create all Nodes
-    nodes: Dict[Any, Node] = {i: Node(name=str(i)) for i in range(len(matrix))}
-    for y_idx, y_node in enumerate(matrix):
-        # Retrieve the Node and add to the Network
-        if str(y_idx) in entry_nodes:
-            nodes[y_idx].entry_node = True
-        if str(y_idx) in positions.keys():
-            x, y = positions[str(y_idx)]
-            nodes[y_idx].x_pos = x
-            nodes[
-                y_idx].y_pos = y  # If the edge hasn't already been added, add it
-        for x_idx, x_node in enumerate(y_node):
-            if x_node == 1:
-                edge = tuple(sorted([y_idx, x_idx]))
-                if edge not in edges:
-                    network.add_edge(nodes[edge[0]], nodes[edge[1]])
+    n_nodes = matrix.shape[0]
+    nodes: Dict[Any, Node] = {i: Node(name=str(i)) for i in range(n_nodes)}
+    for idx, node in nodes.items():
+        if str(idx) in entry_nodes:
+            node.entry_node = True
+        if str(idx) in positions:
+            x, y = positions[str(idx)]
+            node.x_pos = x
+            node.y_pos = y
+    # Add each edge once from the upper triangle, in row-major order, which
+    # neither needs a dense row of a CSR matrix nor len() of it
+    if isinstance(matrix, np.ndarray):
+        upper = np.triu(matrix)
+    else:
+        import scipy.sparse as sp
+        upper = sp.triu(matrix, format='csr')
+    rows, cols = (upper == 1).nonzero()
+    for y_idx, x_idx in zip(rows.tolist(), cols.tolist()):
+        network.add_edge(nodes[y_idx], nodes[x_idx])
     return network
 
 
@@ -3,10 +3,12 @@ that defines the network DB fields."""
 
 from __future__ import annotations
 
+import copy
 import os
+from functools import lru_cache
 from logging import getLogger
 from pathlib import Path
-from typing import Final, List, Optional, Union
+from typing import Final, Iterable, List, Optional, Tuple, Union
 
 from tinydb import TinyDB
 from tinydb.queries import QueryInstance
@@ -362,6 +364,22 @@ class NetworkDB:
 
         return network
 
+    def upsert_many(
+        self,
+        items: Iterable[Tuple[Network, Optional[str], Optional[str],
+                              Optional[str], Optional[bool]]],
+    ) -> List[Network]:
+        """Upsert several :class:`~cyberattacksim.networks.network.Network`
+        in the db with a single write of the db file.
+
+        :param items: ``(network, name, description, author, locked)`` tuples,
+            each passed on to
+            :func:`~cyberattacksim.networks.network_db.NetworkDB.upsert`.
+        :return: The upserted :class:`~cyberattacksim.networks.network.Network`.
+        """
+        with self._db.batch():
+            return [self.upsert(*item) for item in items]
+
     def remove(self, network: Network) -> Union[str, None]:
         """Remove a :class:`~cyberattacksim.networks.network.Network`. from the
         db.
@@ -457,6 +475,12 @@ def default_18_node_network() -> Network:
 
     :return: An instance of :class:`~cyberattacksim.networks.network.Network`.
     """
+    # copy the cached instance, callers mutate the network they are given
+    return copy.deepcopy(_load_default_18_node_network())
+
+
+@lru_cache(maxsize=None)
+def _load_default_18_node_network() -> Network:
     with NetworkDB() as db:
         return db.get('b3cd9dfd-b178-415d-93f0-c9e279b3c511')
 
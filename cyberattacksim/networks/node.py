@@ -1,7 +1,8 @@
 from __future__ import annotations
 
-from typing import List, Optional
-from uuid import uuid4
+import os
+from typing import List, Optional, Sequence
+from uuid import UUID, uuid4
 
 
 class Node:
@@ -25,7 +26,26 @@ class Node:
         :param vulnerability: The vulnerability score of the Node. Has a
             default value of 0.1.
         """
-        self._uuid: str = str(uuid4())
+        self._set_attributes(str(uuid4()), name, high_value_node, entry_node,
+                             vulnerability)
+
+    def _set_attributes(
+        self,
+        uuid: str,
+        name: Optional[str],
+        high_value_node: bool,
+        entry_node: bool,
+        vulnerability: float,
+    ):
+        """Set the attributes of a new Node.
+
+        :param uuid: The UUID of the Node.
+        :param name: An optional name for the Node.
+        :param high_value_node: Whether the Node is a high value node.
+        :param entry_node: Whether the Node is an entry node.
+        :param vulnerability: The vulnerability score of the Node.
+        """
+        self._uuid: str = uuid
         self.name: str = name
         self._high_value_node: bool = high_value_node
         self._entry_node: bool = entry_node
@@ -76,6 +96,48 @@ class Node:
         node.y_pos = y_pos
         return node
 
+    @classmethod
+    def create_many(
+        cls,
+        names: Sequence[Optional[str]],
+        high_value_nodes: Optional[Sequence[bool]] = None,
+        entry_nodes: Optional[Sequence[bool]] = None,
+        vulnerability: float = 0.01,
+    ) -> List[Node]:
+        """Create many instances of Node at once.
+
+        Equivalent to calling the constructor once per name, but the random
+        bytes of all the UUIDs are drawn in a single call.
+
+        :param names: The name of each Node.
+        :param high_value_nodes: Whether each Node is a high value node.
+            Defaults to False for every Node.
+        :param entry_nodes: Whether each Node is an entry node. Defaults to
+            False for every Node.
+        :param vulnerability: The vulnerability score of every Node.
+
+        :return: The instances of Node, in the order of ``names``.
+        """
+        n_nodes = len(names)
+        if high_value_nodes is None:
+            high_value_nodes = [False] * n_nodes
+        if entry_nodes is None:
+            entry_nodes = [False] * n_nodes
+        random_bytes = os.urandom(16 * n_nodes)
+        nodes = []
+        for i, (name, high_value_node, entry_node) in enumerate(
+                zip(names, high_value_nodes, entry_nodes)):
+            node = cls.__new__(cls)
+            node._set_attributes(
+                str(UUID(bytes=random_bytes[16 * i:16 * (i + 1)], version=4)),
+                name,
+                bool(high_value_node),
+                bool(entry_node),
+                vulnerability,
+            )
+            nodes.append(node)
+        return nodes
+
     def reset_vulnerability(self):
         """Resets the nodes current `vulnerability_score` to the original
         `vulnerability`."""
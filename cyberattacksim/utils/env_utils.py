@@ -1,5 +1,7 @@
+import mmap
+import os
 import random
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, List, Tuple, Union
 
 import numpy as np
 
@@ -19,11 +21,17 @@ from cyberattacksim.networks.node import Node
 def create_env(
     env_id: str,
     node_size: int = 18,
+    print_metrics: bool = True,
+    collect_additional_per_ts_data: bool = True,
 ) -> GenericNetworkEnv:
     """Create a CyberAttackSim environment.
 
     :param use_same_net: If true uses a saved network, otherwise creates a new
         network.
+    :param print_metrics: Print the end of episode metrics. Turn off for
+        training runs to keep the per step overhead down.
+    :param collect_additional_per_ts_data: Collect the additional per
+        timestep data returned in the step info.
 
     :returns: A CyberAttackSim OpenAI Gym environment.
     """
@@ -59,9 +67,9 @@ def create_env(
         red_agent=red,
         blue_agent=blue,
         network_interface=network_interface,
-        print_metrics=True,
+        print_metrics=print_metrics,
         show_metrics_every=50,
-        collect_additional_per_ts_data=True,
+        collect_additional_per_ts_data=collect_additional_per_ts_data,
         print_per_ts_data=False,
     )
 
@@ -69,6 +77,43 @@ def create_env(
     return env
 
 
+def _build_network(
+    node_objs: List[Node],
+    nodes: Dict[Any, Node],
+    edges: List[Tuple],
+) -> Network:
+    """Build a network from its nodes and a list of edges.
+
+    The nodes and edges are added with single bulk calls rather than one
+    ``add_node``/``add_edge`` call each.
+
+    :param node_objs: The nodes of the network.
+    :param nodes: The nodes keyed by their name as given, and by its str.
+    :param edges: A list of edges, (node_a, node_b, extra_info)
+    :return: An instance of :class:`~cyberattacksim.networks.network.Network`.
+    """
+    network = Network()
+    network.add_nodes_from(node_objs)
+    # the per node intersect check of add_node, done once for all nodes
+    network._check_intersects()
+    try:
+        edge_nodes = [(nodes[edge[0]], nodes[edge[1]]) for edge in edges]
+    except KeyError:
+        # the edges name the nodes with another type, match them as strings
+        edge_nodes = [(nodes[str(edge[0])], nodes[str(edge[1])])
+                      for edge in edges]
+    network.add_edges_from(edge_nodes)
+    return network
+
+
+def _index_node(nodes: Dict[Any, Node], node_name: Any, node: Node):
+    """Key a node by its name as given and, if that is not a str, by its
+    str as well."""
+    nodes[node_name] = node
+    if not isinstance(node_name, str):
+        nodes[node.name] = node
+
+
 def get_network_from_edges_and_positions(
     edges: List[Tuple],
     positions: Dict[str, np.ndarray],
@@ -80,25 +125,23 @@ def get_network_from_edges_and_positions(
     :param positions: The node positions on a graph.
     :return: An instance of :class:`~cyberattacksim.networks.network.Network`.
     """
-    network = Network()
     nodes: Dict[Any, Node] = {}
-    for node_name in positions:
-        position = positions[node_name].tolist()
-        node = Node(name=str(node_name))
-        nodes[str(node_name)] = node
-        node.x_pos = position[0]
-        node.y_pos = position[1]
-        network.add_node(node)
-    for edge in edges:
-        node_a = str(edge[0])
-        node_b = str(edge[1])
-        network.add_edge(nodes[node_a], nodes[node_b])
-    return network
+    node_objs = Node.create_many([str(node_name) for node_name in positions])
+    # stack the positions to convert them to floats in one go
+    pos_arr = np.asarray(list(positions.values()), dtype=float).reshape(-1, 2)
+    x_positions = pos_arr[:, 0].tolist()
+    y_positions = pos_arr[:, 1].tolist()
+    for node_name, node, x_pos, y_pos in zip(positions, node_objs, x_positions,
+                                             y_positions):
+        node.x_pos = x_pos
+        node.y_pos = y_pos
+        _index_node(nodes, node_name, node)
+    return _build_network(node_objs, nodes, edges)
 
 
 def get_network_from_nodes_edges(
-    node_list: List[str],
-    edges_list: List[Tuple],
+    node_list: Union[List[str], np.ndarray],
+    edges_list: Union[List[Tuple], np.ndarray],
     set_random_entry_nodes: bool = False,
     num_of_random_entry_nodes: int = 0,
     set_random_high_value_nodes: bool = False,
@@ -106,68 +149,103 @@ def get_network_from_nodes_edges(
 ) -> Network:
     """Create a network from a list of node names and a list of edges.
 
-    :param node_names: A list of node names.
-    :param edges: A list of edges, (node_a, node_b, extra_info)
+    :param node_names: A list of node names, or an array of integer names.
+    :param edges: A list of edges, (node_a, node_b, extra_info), or an
+        (n_edges, 2) array of integer names.
     :return: An instance of :class:`~cyberattacksim.networks.network.Network`.
     """
-    network = Network()
+    # integer arrays, e.g. from read_integer_edges, are turned into lists of
+    # ints once, so the lookups below hash plain ints
+    if isinstance(node_list, np.ndarray):
+        node_list = node_list.tolist()
+    if isinstance(edges_list, np.ndarray):
+        edges_list = edges_list.tolist()
     nodes: Dict[Any, Node] = {}
+    entry_nodes = frozenset()
+    high_value_nodes = frozenset()
     if set_random_entry_nodes:
-        possible_entry_nodes = set(node_list)
-        entry_nodes = random.sample(
-            possible_entry_nodes,
-            num_of_random_entry_nodes,
-        )
+        # random.sample no longer accepts a set, so sample the unique names
+        possible_entry_nodes = list(dict.fromkeys(node_list))
+        entry_nodes = frozenset(
+            random.sample(
+                possible_entry_nodes,
+                num_of_random_entry_nodes,
+            ))
 
     if set_random_high_value_nodes:
-        possible_high_value_nodes = set(node_list)
-        high_value_nodes = random.sample(
-            possible_high_value_nodes,
-            num_of_random_high_value_nodes,
-        )
-
-    for node_name in node_list:
-        entry_node = False
-        high_value_node = False
-        if node_name in entry_nodes:
-            entry_node = True
-        if node_name in high_value_nodes:
-            high_value_node = True
-        node = Node(
-            name=str(node_name),
-            entry_node=entry_node,
-            high_value_node=high_value_node,
-        )
-        nodes[str(node_name)] = node
-        network.add_node(node)
-
-    for edge in edges_list:
-        node_a = str(edge[0])
-        node_b = str(edge[1])
-        network.add_edge(nodes[node_a], nodes[node_b])
-    return network
+        possible_high_value_nodes = list(dict.fromkeys(node_list))
+        high_value_nodes = frozenset(
+            random.sample(
+                possible_high_value_nodes,
+                num_of_random_high_value_nodes,
+            ))
+
+    # the sampled names are frozensets, so each membership test is O(1) and
+    # works for any hashable name, e.g. the tuples of nx.grid_2d_graph
+    node_objs = Node.create_many(
+        [str(node_name) for node_name in node_list],
+        high_value_nodes=[
+            node_name in high_value_nodes for node_name in node_list
+        ],
+        entry_nodes=[node_name in entry_nodes for node_name in node_list],
+    )
+    for node_name, node in zip(node_list, node_objs):
+        _index_node(nodes, node_name, node)
+
+    return _build_network(node_objs, nodes, edges_list)
 
 
 def read_nodes_edges_from_file(file_path: str) -> tuple[list, list]:
     """Read edges from a file and return a list of nodes and a list of edges.
 
+    The file is memory mapped and its lines are consumed one at a time, so
+    neither the whole decoded text nor a list of all its lines is held in
+    memory.
+
     Args:
         file_path (str): file path
 
     Returns:
         tuple[list, list]: list of nodes and list of edges
     """
-    nodes = set()
+    # a dict is used as an insertion ordered set of the node names
+    nodes = {}
     edges = []
-    with open(file_path, 'r', encoding='utf-8') as file:
-        for line in file.readlines():
-            parts = line.strip().split(' ')
-            if len(parts) >= 2:
-                start_node = str(parts[0])
-                end_node = str(parts[1])
-                extra_info = parts[2]
-                nodes.add(start_node)
-                nodes.add(end_node)
-                edges.append((start_node, end_node, extra_info))
+    with open(file_path, 'rb') as file:
+        # an empty file cannot be memory mapped
+        if os.fstat(file.fileno()).st_size == 0:
+            return [], edges
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            for line in iter(mm.readline, b''):
+                parts = line.decode('utf-8').strip().split(' ')
+                if len(parts) >= 2:
+                    start_node = parts[0]
+                    end_node = parts[1]
+                    extra_info = parts[2] if len(parts) > 2 else None
+                    nodes[start_node] = None
+                    nodes[end_node] = None
+                    edges.append((start_node, end_node, extra_info))
 
     return list(nodes), edges
+
+
+def read_integer_edges(file_path: str) -> Tuple[np.ndarray, np.ndarray]:
+    """Read edges from a file whose nodes are all named by integers, such as
+    one written by :func:`networkx.write_edgelist` for a generated graph.
+
+    Only the first two columns are parsed, in C by :func:`numpy.loadtxt`,
+    rather than line by line in Python.
+
+    Args:
+        file_path (str): file path
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: the sorted unique nodes and the
+        (n_edges, 2) array of edges
+    """
+    edges = np.loadtxt(file_path,
+                       usecols=(0, 1),
+                       dtype=np.int64,
+                       comments='#',
+                       ndmin=2)
+    return np.unique(edges), edges
@@ -3,6 +3,11 @@ from typing import Any, Dict
 
 import yaml
 
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:  # libyaml bindings are not available
+    from yaml import SafeLoader as _YamlLoader
+
 
 def make_dirs(path: str) -> None:
     """Ensure that a directory exists. If it does not exist, create it.
@@ -13,8 +18,7 @@ def make_dirs(path: str) -> None:
     Returns:
         None
     """
-    if not os.path.exists(path):
-        os.makedirs(path)
+    os.makedirs(path, exist_ok=True)
 
 
 def load_yaml_config(file_path: str) -> Dict[str, Any]:
@@ -23,11 +27,14 @@ def load_yaml_config(file_path: str) -> Dict[str, Any]:
     Args:
         file_path (str): Path to the YAML file.
 
+    Uses the libyaml-backed ``CSafeLoader`` when available and falls back to
+    the pure-Python ``SafeLoader`` otherwise.
+
     Returns:
         Dict[str, Any]: Configuration dictionary.
     """
     with open(file_path, 'r', encoding='utf-8') as file:
-        config = yaml.safe_load(file)
+        config = yaml.load(file, Loader=_YamlLoader)
     return config
 
 
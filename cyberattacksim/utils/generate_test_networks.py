@@ -1,48 +1,87 @@
 """Function to call and generate networks to re-use it across different tests
 and trainings."""
 
+from __future__ import annotations
+
+import hashlib
+import json
 import os
 import pickle
-import sys
-from typing import Any, Dict, Tuple
+from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple, Union
 
-import matplotlib.pyplot as plt
 import networkx as nx
 import numpy as np
-import pandas as pd
 
-sys.path.append(os.getcwd())
 from cyberattacksim.networks.network_creator import create_mesh
 
+if TYPE_CHECKING:
+    import scipy.sparse as sp
+
+# suffix of adjacency matrices saved in CSR form by save_csr
+CSR_SUFFIX = '.csr.npz'
+
+
+def _is_array_dict(obj: Any) -> bool:
+    """Whether an object is a dict of str keys to numpy arrays, which can be
+    saved with :func:`numpy.savez` instead of pickle."""
+    return (isinstance(obj, dict) and bool(obj) and all(
+        isinstance(key, str) and key not in
+        ('file', 'allow_pickle') and isinstance(value, np.ndarray)
+        for key, value in obj.items()))
+
 
-def dump_pkl(obj: Any, name: str) -> None:
+def dump_pkl(obj: Any, name: str, compress: bool = False) -> None:
     """Simple function to dump objects into pickle files.
 
+    The format follows the extension of ``name``: a ".npz" name saves a dict
+    of numpy arrays with :func:`numpy.savez`, which is faster to write and
+    read and needs no pickle. Any other name pickles the object with the
+    highest protocol.
+
     Args:
         obj (Any): The object to be pickled.
         name (str): The name of the file where the object will be stored.
-                    If the name does not end with ".pkl", it will be appended.
+                    If the name ends with neither ".npz" nor ".pkl", ".pkl"
+                    will be appended.
+        compress (bool): Whether a ".npz" file is saved compressed.
 
     Returns:
         None
     """
+    if name.endswith('.npz'):
+        if not _is_array_dict(obj):
+            raise ValueError(
+                f'Only a dict of str keys to numpy arrays can be saved to '
+                f"'{name}', use a .pkl name to pickle other objects.")
+        savez = np.savez_compressed if compress else np.savez
+        savez(name, **obj)
+        return
+
     if not name.endswith('.pkl'):
         name += '.pkl'
 
     with open(name, 'wb') as file:
-        pickle.dump(obj, file)
+        pickle.dump(obj, file, protocol=pickle.HIGHEST_PROTOCOL)
 
 
 def load_pkl(name: str) -> Any:
     """Function to load objects from pickle files.
 
+    A ".npz" name is loaded as the dict of numpy arrays :func:`dump_pkl` saved
+    to it.
+
     Args:
         name (str): The name of the pickle file to load.
-                    If the name does not end with ".pkl", it will be appended.
+                    If the name ends with neither ".npz" nor ".pkl", ".pkl"
+                    will be appended.
 
     Returns:
         Any: The object loaded from the pickle file.
     """
+    if name.endswith('.npz'):
+        with np.load(name, allow_pickle=False) as arrays:
+            return dict(arrays)
+
     if not name.endswith('.pkl'):
         name += '.pkl'
 
@@ -50,6 +89,134 @@ def load_pkl(name: str) -> Any:
         return pickle.load(file)
 
 
+def positions_filename(filename: str) -> str:
+    """Name of the JSON file holding the node positions of a saved network.
+
+    Args:
+        filename (str): The .npy (or older .npz) file of the network's
+                        adjacency matrix.
+
+    Returns:
+        str: The path of the companion positions file.
+    """
+    for ext in (CSR_SUFFIX, '.npy', '.npz'):
+        if filename.endswith(ext):
+            filename = filename[:-len(ext)]
+            break
+    return filename + '.positions.json'
+
+
+def save_csr(filename: str, matrix: Union[np.ndarray, sp.csr_matrix]) -> None:
+    """Function to save an adjacency matrix in CSR form.
+
+    Only the row pointers, the column indices and the shape are stored, as
+    every edge has a weight of 1, so the file grows with the number of edges
+    rather than with the square of the number of nodes.
+
+    Args:
+        filename (str): The file to save the matrix to, ending in ".csr.npz".
+        matrix (Union[np.ndarray, sp.csr_matrix]): The adjacency matrix.
+    """
+    import scipy.sparse as sp
+
+    csr = sp.csr_matrix(matrix)
+    np.savez(filename,
+             indptr=csr.indptr,
+             indices=csr.indices,
+             shape=np.asarray(csr.shape))
+
+
+def load_csr(filename: str) -> sp.csr_matrix:
+    """Function to load an adjacency matrix saved by :func:`save_csr`.
+
+    Args:
+        filename (str): The ".csr.npz" file of the matrix.
+
+    Returns:
+        sp.csr_matrix: The adjacency matrix in CSR form.
+    """
+    import scipy.sparse as sp
+
+    with np.load(filename, allow_pickle=False) as csr_file:
+        indptr = csr_file['indptr']
+        indices = csr_file['indices']
+        shape = tuple(csr_file['shape'])
+    return sp.csr_matrix((np.ones(len(indices)), indices, indptr), shape=shape)
+
+
+def load_matrix(filename: str) -> np.ndarray:
+    """Function to load the adjacency matrix of a saved network.
+
+    A .npy matrix is memory mapped rather than read, so processes loading the
+    same network share its pages. The returned array is then read-only, use
+    ``matrix.copy()`` if it has to be modified. A CSR matrix is expanded to a
+    dense one and an older .npz matrix is read in full.
+
+    Args:
+        filename (str): The .npy, .csr.npz (or older .npz) file of the
+                        network's adjacency matrix.
+
+    Returns:
+        np.ndarray: The adjacency matrix.
+    """
+    if filename.endswith(CSR_SUFFIX):
+        return load_csr(filename).toarray()
+    if filename.endswith('.npz'):
+        with np.load(filename, allow_pickle=False) as network_file:
+            return network_file['matrix']
+    return np.load(filename, mmap_mode='r', allow_pickle=False)
+
+
+def load_network(
+        filename: str) -> Tuple[Union[np.ndarray, sp.csr_matrix], Dict]:
+    """Function to load a network saved by :func:`create_network`.
+
+    Args:
+        filename (str): The .npy, .csr.npz (or older .npz) file of the
+                        network's adjacency matrix.
+
+    Returns:
+        Tuple[Union[np.ndarray, sp.csr_matrix], Dict]: A tuple containing the
+            dense (.npy, .npz) or CSR (.csr.npz) adjacency matrix and node
+            positions.
+    """
+    # CSR saves stay sparse, unlike the dense matrix of load_matrix
+    if filename.endswith(CSR_SUFFIX):
+        matrix = load_csr(filename)
+    else:
+        matrix = load_matrix(filename)
+    positions_file_name = positions_filename(filename)
+    if (filename.endswith('.npz') and not filename.endswith(CSR_SUFFIX)
+            and not os.path.exists(positions_file_name)):
+        # the oldest saves keep the positions dict inside the .npz itself,
+        # stored as a pickled object array
+        with np.load(filename, allow_pickle=True) as network_file:
+            return matrix, network_file['positions'].item()
+    with open(positions_file_name) as positions_file:
+        positions = json.load(positions_file)
+    return matrix, positions
+
+
+def graph_from_matrix(matrix: Union[np.ndarray, sp.csr_matrix]) -> nx.Graph:
+    """Build a graph from an adjacency matrix, naming the nodes by the str of
+    their index.
+
+    Args:
+        matrix (Union[np.ndarray, sp.csr_matrix]): The dense or CSR adjacency
+                                                   matrix.
+
+    Returns:
+        nx.Graph: The graph of the matrix.
+    """
+    if isinstance(matrix, np.ndarray):
+        graph = nx.from_numpy_array(matrix)
+    else:
+        graph = nx.from_scipy_sparse_array(matrix)
+    mapping = {i: str(i) for i in range(matrix.shape[0])}
+    nx.relabel_nodes(graph, mapping, copy=False)
+    return graph
+
+
 def create_network(
     n_nodes: int,
     connectivity: float,
@@ -57,7 +224,8 @@ def create_network(
     filename: str,
     save_matrix: bool = True,
     save_graph: bool = False,
-) -> Tuple[np.ndarray, Dict]:
+    sparse: Optional[bool] = None,
+) -> Tuple[Union[np.ndarray, sp.csr_matrix], Dict]:
     """Function to create a network and optionally save it for reuse.
 
     Args:
@@ -65,43 +233,104 @@ def create_network(
         connectivity (float): Percentage of edges connecting the nodes.
         output_dir (str): Directory to save the network files.
         filename (str): Base name for saving the network files.
-        save_matrix (bool): Whether to save the matrix and edges as a .npz file.
-        save_graph (bool): Whether to save the graph as a .npz file.
+        save_matrix (bool): Whether to save the matrix as a .npy file and the
+                            positions as a companion .json file.
+        save_graph (bool): Whether to save the graph as an adjacency list
+                           file.
+        sparse (Optional[bool]): Whether the matrix is returned in CSR form
+                                 and saved as a .csr.npz file instead of a
+                                 dense .npy file. By default it is when the
+                                 connectivity is below 0.5.
 
     Returns:
-        Tuple[np.ndarray, Dict]: A tuple containing the adjacency matrix and node positions.
+        Tuple[Union[np.ndarray, sp.csr_matrix], Dict]: A tuple containing the adjacency matrix and node positions.
     """
 
     # Use the Cyber Attack Simulatorgenerator to create the mesh of given size
     matrix, positions = create_mesh(size=n_nodes, connectivity=connectivity)
+    if sparse is None:
+        sparse = connectivity < 0.5
+    if sparse:
+        import scipy.sparse as sp
 
-    nodes = [str(i) for i in range(n_nodes)]
-
-    # Create the DataFrame for the graph
-    graph_df = pd.DataFrame(matrix, index=nodes, columns=nodes)
-
-    # Create a graph for visualization
-    graph = nx.from_pandas_adjacency(graph_df)
+        matrix = sp.csr_matrix(matrix)
 
     # Check if the filename has the right extension
-    if not filename.endswith('.npz'):
-        filename += '.npz'
+    if filename.endswith('.npz'):
+        filename = filename[:-len('.npz')]
+    if not filename.endswith('.npy'):
+        filename += '.npy'
     filen = os.path.join(output_dir, filename)
 
-    # Save the matrix and positions as .npz file if save_matrix is True
+    # Save the matrix as a raw .npy file and the positions as .json file if
+    # save_matrix is True, so that neither needs pickle to be loaded
     if save_matrix:
-        np.savez(filen, matrix=matrix, positions=positions)
-
-    # Save the graph as .npz file if save_graph is True
+        if sparse:
+            save_csr(filen[:-len('.npy')] + CSR_SUFFIX, matrix)
+        else:
+            np.save(filen, matrix)
+        with open(positions_filename(filen), 'w') as positions_file:
+            json.dump(positions, positions_file)
+
+    # Save the graph as an adjacency list if save_graph is True
     if save_graph:
-        graph_filename = os.path.join(output_dir,
-                                      filename.replace('.npz', '_graph.npz'))
-        np.savez(graph_filename, graph=graph)
+        graph = graph_from_matrix(matrix)
+        graph_filename = os.path.join(
+            output_dir, filename.replace('.npy', '_graph.adjlist'))
+        nx.write_adjlist(graph, graph_filename)
 
     return matrix, positions
 
 
+def cached_spring_layout(
+    graph: nx.Graph,
+    seed: int,
+    cache_dir: str,
+    matrix: Optional[Union[np.ndarray, sp.csr_matrix]] = None,
+    iterations: int = 50,
+) -> Dict:
+    """Function to compute the spring layout of a graph, cached on disk.
+
+    The layout only depends on the adjacency matrix, the seed and the number
+    of iterations, so it is saved under a hash of them and loaded again on
+    the next run instead of re-running the O(n^2) per iteration layout.
+
+    Args:
+        graph (nx.Graph): The graph to lay out.
+        seed (int): The seed of the layout.
+        cache_dir (str): The directory the layouts are cached in.
+        matrix (Optional[Union[np.ndarray, sp.csr_matrix]]): The adjacency
+            matrix of the graph, built from the graph when not given.
+        iterations (int): The number of iterations of the layout.
+
+    Returns:
+        Dict: The position of each node.
+    """
+    if matrix is None:
+        matrix = nx.to_numpy_array(graph)
+    if isinstance(matrix, np.ndarray):
+        matrix_bytes = np.ascontiguousarray(matrix).tobytes()
+    else:
+        matrix_bytes = matrix.indptr.tobytes() + matrix.indices.tobytes()
+    key = hashlib.blake2b(matrix_bytes, digest_size=16).hexdigest()
+    # pickled, as the node names are not always str
+    cache_file = os.path.join(cache_dir, f'{key}_{seed}_{iterations}.pkl')
+    if os.path.exists(cache_file):
+        return load_pkl(cache_file)
+
+    pos = nx.spring_layout(graph, iterations=iterations, seed=seed)
+    os.makedirs(cache_dir, exist_ok=True)
+    dump_pkl(pos, cache_file)
+    return pos
+
+
 def main():
+    # pyplot is only needed to draw the example figures, so it is not
+    # imported by the scripts that just create or load networks
+    import matplotlib.pyplot as plt
+
+    # the figures are only saved to file, so render without a display
+    plt.switch_backend('Agg')
     # example running
     current_dir = os.getcwd()
     outdir = os.path.join(current_dir, 'work_dir', 'test_networks')
@@ -123,39 +352,44 @@ def main():
         )
         # the positions are not relevant in this specific example
 
-        nodes = [str(i) for i in range(n_nodes)]
-
-        graph_df = pd.DataFrame(matrix, index=nodes, columns=nodes)
-
         # generate the graph using the adjacency matrix
-        graph = nx.from_pandas_adjacency(graph_df)
+        graph = graph_from_matrix(matrix)
 
         # seed the position for replicability
-        my_pos = nx.spring_layout(graph, seed=99)
+        my_pos = cached_spring_layout(graph,
+                                      seed=99,
+                                      cache_dir=os.path.join(
+                                          outdir, '.layout_cache'),
+                                      matrix=matrix)
 
         graph_name = str(n_nodes) + '_nodes_graph.png'
         figure_name = os.path.join(outdir, graph_name)
         plt.figure(figsize=(12, 9), dpi=150)
-        nx.draw(
+        # the nodes are drawn as one scatter and the edges as one line
+        # collection, instead of one artist each
+        nx.draw_networkx_nodes(
             graph,
-            with_labels=True,
+            pos=my_pos,
             node_size=300,
             node_shape='8',
+            linewidths=0.5,
+            alpha=1,
+        )
+        nx.draw_networkx_edges(graph, pos=my_pos, width=0.8, alpha=1)
+        nx.draw_networkx_labels(
+            graph,
             pos=my_pos,
             verticalalignment='center',
             horizontalalignment='left',
             clip_on=False,
             font_weight='normal',
-            linewidths=0.5,
-            alpha=1,
-            width=0.8,
         )
         plt.title('Example graph')
         plt.axis('off')
         # plt.tight_layout() # sometimes it complains
-        plt.show()
         # save the figure
         plt.savefig(figure_name)
+        plt.close()
 
 
 if __name__ == '__main__':
@@ -81,6 +81,7 @@ def plot_training_performance(
         plt.tight_layout()
         if save_plot:
             plt.savefig(os.path.join(plot_dir, plot_name + '.png'), dpi=200)
+            plt.close()
         else:
             plt.show()
     else:
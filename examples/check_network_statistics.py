@@ -2,13 +2,24 @@
 
 import os
 
-import matplotlib.pyplot as plt
-import networkx as nx
-import numpy as np
-import pandas as pd
+import matplotlib
 
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt  # noqa: E402
+import networkx as nx  # noqa: E402
+import numpy as np  # noqa: E402
 
-def process_graph_statistics(graph) -> None:
+from cyberattacksim.utils import generate_test_networks as gtn  # noqa: E402
+
+
+def process_graph_statistics(graph, matrix) -> None:
+    # Binary adjacency matrix without self loops, matching the graph
+    adj = (np.asarray(matrix) != 0).astype(np.float64)
+    np.fill_diagonal(adj, 0.0)
+    adj_sq = adj @ adj
+    # Closed walks of length 3 through each node (twice its triangles)
+    closed_walks = np.einsum('ij,ji->i', adj_sq, adj)
+    degree = adj.sum(axis=1)
     # Calculate network statistics
     print('---------------------------')
     # Calculate the number of nodes
@@ -16,20 +27,23 @@ def process_graph_statistics(graph) -> None:
     # Calculate the number of edges
     print('number of edges:', graph.size())
     # Calculate the clustering
-    clust = nx.clustering(graph)
+    denom = degree * (degree - 1)
+    clust = np.divide(closed_walks,
+                      denom,
+                      out=np.zeros_like(closed_walks),
+                      where=denom > 0)
 
     # Calculate the number of clusters
-    num_clusters = np.sum([clust[key] for key in clust.keys()])
+    num_clusters = clust.sum()
     print(f'{num_clusters} total number of clusters')
     print('---------------------------')
     # Calcualte the average clustering of the graph
-    avg_clustering = nx.average_clustering(graph)
+    avg_clustering = clust.mean() if clust.size else 0.0
     print(f'{avg_clustering} average clustering')
     print('---------------------------')
-    # Calculate the number of triangles present
-    triangls = nx.triangles(graph)
-    # Calculate the total number of triangles
-    num_triangles = np.sum([triangls[key] for key in triangls.keys()])
+    # Calculate the total number of triangles, summed per node as with
+    # ``nx.triangles``: trace(A^3) / 2, i.e. three times trace(A^3) / 6
+    num_triangles = int(round(closed_walks.sum() / 2))
     print(f'{num_triangles} total number of triangles')
     print('---------------------------')
 
@@ -42,19 +56,22 @@ if __name__ == '__main__':
     files = os.listdir(network_dir)
     # loop over the files
     for file_name in files:
+        # the dense and CSR matrices saved by gtn.create_network
+        if not file_name.endswith(('.npy', gtn.CSR_SUFFIX)):
+            continue
         ifile = os.path.join(network_dir, file_name)
         num_triangles, num_clusters = 0, 0
-        matrix = np.load(ifile, allow_pickle=True)['matrix']
-        df = pd.DataFrame(matrix)
-        graph = nx.from_pandas_adjacency(df)
-        process_graph_statistics(graph)
+        matrix = gtn.load_matrix(ifile)
+        graph = nx.from_numpy_array(matrix)
+        process_graph_statistics(graph, matrix)
         # seed the position for replicability
         my_pos = nx.spring_layout(graph, seed=99)
-        graph_name = file_name.replace('npz', 'png')
+        graph_name = os.path.splitext(file_name)[0] + '.png'
         figure_name = os.path.join(network_dir, graph_name)
-        plt.figure(figsize=(12, 9), dpi=150)
+        fig = plt.figure(figsize=(12, 9), dpi=150)
         nx.draw(
             graph,
+            ax=fig.gca(),
             with_labels=True,
             node_size=300,
             node_shape='8',
@@ -69,6 +86,6 @@ if __name__ == '__main__':
         )
         plt.title('Example graph')
         plt.axis('off')
-        plt.show()
-        # save the figure
-        plt.savefig(figure_name)
+        # save the figure and release it before the next network
+        fig.savefig(figure_name)
+        plt.close(fig)
@@ -65,6 +65,20 @@ class RLArguments:
         default=10,
         metadata={'help': 'Number of episodes to evaluate. Defaults to 10'},
     )
+    eval_frequency: int = field(
+        default=10000,
+        metadata={
+            'help':
+            'Number of training timesteps between evaluations. Defaults to 10000'
+        },
+    )
+    compile_policy: bool = field(
+        default=False,
+        metadata={
+            'help':
+            'Compile the policy forward and predict passes with torch.compile. Defaults to False'
+        },
+    )
     # Logging and saving
     work_dir: str = field(
         default='work_dir',
@@ -1,7 +1,9 @@
 import argparse
 import os
 import sys
+from functools import partial
 
+import torch
 import tyro
 import wandb
 from stable_baselines3 import A2C, DQN, PPO
@@ -9,19 +11,68 @@ from stable_baselines3.a2c import MlpPolicy as A2CMlp
 from stable_baselines3.common.callbacks import (
     EvalCallback, StopTrainingOnNoModelImprovement)
 from stable_baselines3.common.evaluation import evaluate_policy
-from stable_baselines3.common.monitor import Monitor
 from stable_baselines3.dqn import MlpPolicy as DQNMlp
 from stable_baselines3.ppo import MlpPolicy as PPOMlp
 from wandb.integration.sb3 import WandbCallback
 
 sys.path.append(os.getcwd())
 from cyberattacksim.envs.generic.core.action_loops import ActionLoop
+from cyberattacksim.experiment_helpers.sb3 import (AsyncCheckpointCallback,
+                                                   init_vec_env,
+                                                   resolve_vec_backend)
 from cyberattacksim.utils.env_utils import create_env
 from cyberattacksim.utils.file_utils import (load_yaml_config,
                                              update_dataclass_from_dict)
 from examples.configs.rl_args import A2CArguments, DQNArguments, PPOArguments
 
 
+def build_agent(args, env, tf_log_dir: str):
+    """Create the SB3 agent of ``args.algo_name`` with its hyper parameters
+    taken from the parsed arguments."""
+    if args.algo_name == 'dqn':
+        return DQN(
+            policy=DQNMlp,
+            env=env,
+            learning_rate=args.learning_rate,
+            buffer_size=args.buffer_size,
+            tau=args.soft_update_tau,
+            learning_starts=args.warmup_learn_steps,
+            batch_size=args.batch_size,
+            train_freq=args.train_frequency,
+            gradient_steps=args.gradient_steps,
+            target_update_interval=args.target_update_frequency,
+            tensorboard_log=tf_log_dir,
+            device='cpu',
+            verbose=1,
+        )
+    # the on-policy algorithms share the rollout and loss settings
+    on_policy_kwargs = dict(
+        env=env,
+        learning_rate=args.learning_rate,
+        n_steps=args.rollout_steps,
+        gamma=args.gamma,
+        gae_lambda=args.gae_lambda,
+        ent_coef=args.ent_coef,
+        vf_coef=args.vf_coef,
+        max_grad_norm=args.max_grad_norm,
+        normalize_advantage=args.normalize_advantage,
+        tensorboard_log=tf_log_dir,
+        device='cpu',
+        verbose=1,
+    )
+    if args.algo_name == 'a2c':
+        return A2C(policy=A2CMlp, **on_policy_kwargs)
+    if args.algo_name == 'ppo':
+        return PPO(
+            policy=PPOMlp,
+            batch_size=args.batch_size,
+            n_epochs=args.n_epochs,
+            clip_range=args.clip_range,
+            **on_policy_kwargs,
+        )
+    raise NotImplementedError
+
+
 def main() -> None:
     # Initialize ArgumentParser
     parser = argparse.ArgumentParser(description='Cyber Attack Sim')
@@ -84,92 +135,99 @@ def main() -> None:
                      project=args.project,
                      name=args.env_id,
                      sync_tensorboard=True)
-    env = create_env(env_id=args.env_id)
-    # setup the monitor to check the training
-    env = Monitor(env, model_name)
+    # training and evaluation envs skip the per step metrics and data
+    make_env = partial(create_env,
+                       env_id=args.env_id,
+                       print_metrics=False,
+                       collect_additional_per_ts_data=False)
+    # more worker processes than cores only adds context switching
+    num_envs = min(args.num_envs, os.cpu_count() or 1)
+    # the small MLP policies run on cpu, leave the remaining cores to the
+    # env worker processes instead of torch's intra-op threads
+    torch.set_num_threads(max(1, (os.cpu_count() or 1) // num_envs))
+    # step num_envs copies of the env in parallel worker processes, the
+    # VecMonitor records the training episodes of all of them. Workers are
+    # started from a clean forkserver rather than forking the parent, which
+    # already holds wandb and torch state.
+    # the training and evaluation envs share a backend, timed only once
+    vec_backend = resolve_vec_backend(make_env)
+    env = init_vec_env(make_env,
+                       n_envs=num_envs,
+                       monitor_path=model_name,
+                       start_method='forkserver',
+                       backend=vec_backend)
+    # separate envs for evaluation, stepped in parallel so that an
+    # evaluation runs n_eval_envs episodes at a time
+    n_eval_envs = 4
+    eval_env = init_vec_env(make_env,
+                            n_envs=n_eval_envs,
+                            start_method='forkserver',
+                            backend=vec_backend)
+    # a multiple of n_eval_envs episodes keeps every eval worker busy
+    n_eval_episodes = -(-args.eval_episodes // n_eval_envs) * n_eval_envs
     # define callback to stop the trainingX
     stop_train_callback = StopTrainingOnNoModelImprovement(
         max_no_improvement_evals=5, min_evals=10, verbose=1)
     print(stop_train_callback)
     eval_callback = EvalCallback(
-        env,
-        n_eval_episodes=10,
-        eval_freq=1000,  # eval_freq
+        eval_env,
+        n_eval_episodes=n_eval_episodes,
+        # counted in vectorized steps, i.e. num_envs timesteps each
+        eval_freq=max(1, args.eval_frequency // num_envs),
         log_path=model_dir,  # save the logs
         best_model_save_path=model_dir,  # save the model
         deterministic=True,
         render=False,
         verbose=1,
     )
+    # the final model is still saved and uploaded by wandb, intermediate
+    # checkpoints are written from a background thread
     wandb_callback = WandbCallback(
         model_save_path=model_dir,
-        model_save_freq=1000,
+        model_save_freq=0,
         verbose=2,
     )
-    if args.algo_name == 'dqn':
-        agent = DQN(
-            policy=DQNMlp,
-            env=env,
-            learning_rate=args.learning_rate,
-            buffer_size=args.buffer_size,
-            tau=args.soft_update_tau,
-            learning_starts=args.warmup_learn_steps,
-            batch_size=args.batch_size,
-            train_freq=args.train_frequency,
-            gradient_steps=args.gradient_steps,
-            target_update_interval=args.target_update_frequency,
-            tensorboard_log=tf_log_dir,
-            verbose=1,
-        )
+    checkpoint_callback = AsyncCheckpointCallback(
+        save_freq=max(1, 50000 // num_envs),
+        save_path=os.path.join(model_dir, 'checkpoints'),
+        name_prefix=args.algo_name,
+    )
+    agent = build_agent(args, env, tf_log_dir)
 
-    elif args.algo_name == 'a2c':
-        agent = A2C(
-            policy=A2CMlp,
-            env=env,
-            learning_rate=args.learning_rate,
-            n_steps=args.rollout_steps,
-            gamma=args.gamma,
-            gae_lambda=args.gae_lambda,
-            ent_coef=args.ent_coef,
-            vf_coef=args.vf_coef,
-            max_grad_norm=args.max_grad_norm,
-            normalize_advantage=args.normalize_advantage,
-            tensorboard_log=tf_log_dir,
-            verbose=1,
-        )
-    elif args.algo_name == 'ppo':
-        agent = PPO(
-            policy=PPOMlp,
-            env=env,
-            learning_rate=args.learning_rate,
-            n_steps=args.rollout_steps,
-            batch_size=args.batch_size,
-            n_epochs=args.n_epochs,
-            gamma=args.gamma,
-            gae_lambda=args.gae_lambda,
-            clip_range=args.clip_range,
-            normalize_advantage=args.normalize_advantage,
-            ent_coef=args.ent_coef,
-            vf_coef=args.vf_coef,
-            max_grad_norm=args.max_grad_norm,
-            tensorboard_log=tf_log_dir,
-            verbose=1,
-        )
+    if args.compile_policy:
+        # compile only the forward pass used to collect rollouts, the policy
+        # module itself stays unwrapped so saved state_dict keys are unchanged
+        torch.set_float32_matmul_precision('high')
+        if args.algo_name == 'dqn':
+            # DQN predicts through its q_net and never calls policy.forward
+            agent.policy.q_net.forward = torch.compile(
+                agent.policy.q_net.forward)
+        else:
+            agent.policy.forward = torch.compile(agent.policy.forward)
 
     # Train the agent
 
     agent.learn(
         total_timesteps=args.max_timesteps,
-        callback=[eval_callback, wandb_callback],
+        callback=[eval_callback, wandb_callback, checkpoint_callback],
         log_interval=args.train_log_interval,
         progress_bar=True,
     )
-    evaluate_policy(agent, env, n_eval_episodes=args.eval_episodes)
+    # evaluate on the vectorized eval envs, so each policy forward pass
+    # predicts the actions of n_eval_envs episodes at once and the training
+    # monitor log only holds training episodes
+    evaluate_policy(agent, eval_env, n_eval_episodes=n_eval_episodes)
     # save the trained-converged model
     agent.save(model_name)
     run.finish()
+    env.close()
+    eval_env.close()
     # visualize the trained-converged model
-    loop = ActionLoop(env, agent, episode_count=5)
+    render_env = create_env(env_id=args.env_id)
+    loop = ActionLoop(render_env,
+                      agent,
+                      episode_count=5,
+                      compile_policy=args.compile_policy)
     loop.gif_action_loop(
         save_gif=True,
         render_network=True,
@@ -177,6 +235,8 @@ def main() -> None:
         gif_output_directory=media_dir,
         webm_output_directory=media_dir,
     )
+    # closes the render figure of the env
+    render_env.close()
 
 
 if __name__ == '__main__':
@@ -10,11 +10,16 @@ CyberAttack.
 """
 
 import argparse
+import hashlib
 import os
+import pickle
 import sys
 import time
 from copy import deepcopy
+from functools import lru_cache, partial
+from importlib.metadata import PackageNotFoundError, version
 from importlib.resources import files
+from pathlib import Path
 
 import gymnasium as gym
 from stable_baselines3 import PPO
@@ -28,6 +33,52 @@ from cyberwheel.network.network_base import Network
 from cyberwheel.red_agents import ARTAgent
 from cyberwheel.red_agents.strategies import DFSImpact, ServerDowntime
 
+from cyberattacksim.experiment_helpers.sb3 import init_vec_env
+
+NETWORK_CACHE_DIR = Path.home() / '.cache' / 'cyberwheel'
+
+MASSIVE_NETWORK_CONFIGS = {
+    size: f'{size}-host-network.yaml'
+    for size in (10, 50, 200, 1000, 5000, 10000, 100000, 150000)
+}
+
+
+def _cyberwheel_version() -> str:
+    """The installed cyberwheel version, the pickled networks are instances
+    of its classes."""
+    try:
+        return version('cyberwheel')
+    except PackageNotFoundError:
+        return 'unknown'
+
+
+@lru_cache(maxsize=None)
+def _load_network(network_config: str, mtime: float, red_agent: str):
+    """Parse a network YAML and map its services, memoized per process on the
+    config path and modification time and pickled to disk keyed on the
+    config's content and the cyberwheel version."""
+    with open(network_config, 'rb') as f:
+        config_hash = hashlib.sha1(f.read()).hexdigest()
+    cache_id = f'{config_hash}:{_cyberwheel_version()}:{red_agent}'
+    key = hashlib.sha1(cache_id.encode()).hexdigest()
+    cache_file = NETWORK_CACHE_DIR / f'{key}.pkl'
+    if cache_file.exists():
+        with open(cache_file, 'rb') as f:
+            return pickle.load(f)
+
+    print(f'Building network: {network_config} ...')
+    network = Network.create_network_from_yaml(network_config)
+
+    print('Mapping attack validity to hosts...', end=' ')
+    service_mapping = {}
+    if red_agent == 'art_agent':
+        service_mapping = ARTAgent.get_service_map(network)
+
+    NETWORK_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    with open(cache_file, 'wb') as f:
+        pickle.dump((network, service_mapping), f, protocol=5)
+    return network, service_mapping
+
 
 def create_cyberwheel_env(
     network_config: str = '15-host-network.yaml',
@@ -48,13 +99,11 @@ def create_cyberwheel_env(
     # Load network from yaml here
     network_config = files('cyberwheel.resources.configs.network').joinpath(
         network_config)
-    print(f'Building network: {network_config} ...')
-    network = Network.create_network_from_yaml(network_config)
-
-    print('Mapping attack validity to hosts...', end=' ')
-    service_mapping = {}
-    if red_agent == 'art_agent':
-        service_mapping = ARTAgent.get_service_map(network)
+    network, service_mapping = _load_network(
+        str(network_config),
+        os.path.getmtime(network_config),
+        red_agent,
+    )
 
     if red_strategy == 'dfs_impact':
         red_strategy = DFSImpact
@@ -82,24 +131,10 @@ def create_cyberwheel_env(
 
 
 def create_massive_node_env(network_size: int = 10):
-    if network_size == 10:
-        network_config = '10-host-network.yaml'
-    if network_size == 50:
-        network_config = '50-host-network.yaml'
-    if network_size == 200:
-        network_config = '200-host-network.yaml'
-
-    if network_size == 1000:
-        network_config = '1000-host-network.yaml'
-    if network_size == 5000:
-        network_config = '5000-host-network.yaml'
-    if network_size == 10000:
-        network_config = '10000-host-network.yaml'
-
-    if network_size == 100000:
-        network_config = '100000-host-network.yaml'
-    if network_size == 150000:
-        network_config = '150000-host-network.yaml'
+    if network_size not in MASSIVE_NETWORK_CONFIGS:
+        raise ValueError(f'No network config for {network_size} hosts, '
+                         f'choose from {sorted(MASSIVE_NETWORK_CONFIGS)}')
+    network_config = MASSIVE_NETWORK_CONFIGS[network_size]
 
     env = create_cyberwheel_env(network_config)
 
@@ -117,9 +152,30 @@ def main() -> None:
         default=1000,
         help='Number of the massive network node size. Defaults to 1000',
     )
+    parser.add_argument(
+        '--num_envs',
+        type=int,
+        default=4,
+        help='Number of environments stepped in parallel. Defaults to 4',
+    )
+    parser.add_argument(
+        '--eval_freq',
+        type=int,
+        default=None,
+        help='Training timesteps between evaluations. Defaults to 10 PPO '
+        'rollouts',
+    )
+    parser.add_argument(
+        '--n_eval_episodes',
+        type=int,
+        default=None,
+        help='Episodes per evaluation. Defaults to fewer episodes for larger '
+        'networks',
+    )
     args = parser.parse_args()
 
-    env = create_massive_node_env(network_size=args.massive_node_size)
+    make_env = partial(create_massive_node_env,
+                       network_size=args.massive_node_size)
     # get the current directory
     current_dir = os.getcwd()
     # directories
@@ -128,16 +184,34 @@ def main() -> None:
     filename = f'random_connected_graph_{round(time.time())}'
     model_name = os.path.join(log_dir, filename)
 
-    # setup the monitor to check the training
-    env = Monitor(env, model_name)
-    env.reset()
-
-    agent = PPO(PPOMlp, env, verbose=1, tensorboard_log=tensorboard_log_dir)
-
-    eval_callback = EvalCallback(Monitor(env),
-                                 eval_freq=100,
-                                 deterministic=False,
-                                 render=True)
+    # step the envs in parallel worker processes and monitor the training.
+    # Each worker builds its own network, the forkserver keeps the parent's
+    # memory out of the workers and pinning stops them contending for cache.
+    env = init_vec_env(make_env,
+                       n_envs=args.num_envs,
+                       monitor_path=model_name,
+                       start_method='forkserver',
+                       pin_workers=True,
+                       backend='subproc')
+
+    agent = PPO(PPOMlp,
+                env,
+                verbose=1,
+                tensorboard_log=tensorboard_log_dir,
+                device='cpu')
+
+    # evaluations on large networks are expensive, so evaluate every few
+    # rollouts and run fewer episodes the larger the network gets
+    eval_freq = args.eval_freq or max(100, agent.n_steps * args.num_envs * 10)
+    n_eval_episodes = args.n_eval_episodes or max(
+        1, 5 // max(1, args.massive_node_size // 1000))
+    eval_callback = EvalCallback(
+        Monitor(make_env()),
+        n_eval_episodes=n_eval_episodes,
+        # counted in vectorized steps
+        eval_freq=max(1, eval_freq // args.num_envs),
+        deterministic=False,
+        render=True)
 
     agent.learn(total_timesteps=100000, callback=eval_callback)
 
@@ -12,6 +12,7 @@ CyberAttack.
 import os
 import sys
 import time
+from copy import deepcopy
 
 from stable_baselines3 import PPO
 from stable_baselines3.common.callbacks import EvalCallback
@@ -29,6 +30,28 @@ from cyberattacksim.game_modes.game_mode_db import default_game_mode
 from cyberattacksim.networks import network_creator
 
 
+def make_env(network,
+             game_mode,
+             collect_metrics: bool = True) -> GenericNetworkEnv:
+    """Build an env on its own copy of the network and game mode."""
+    network_interface = NetworkInterface(game_mode=deepcopy(game_mode),
+                                         network=deepcopy(network))
+
+    red = SineWaveRedAgent(network_interface)
+    blue = BlueInterface(network_interface)
+
+    env = GenericNetworkEnv(
+        red,
+        blue,
+        network_interface,
+        print_metrics=collect_metrics,
+        show_metrics_every=10,
+        collect_additional_per_ts_data=collect_metrics,
+        print_per_ts_data=False,
+    )
+    return env
+
+
 def main():
     """Run the custom config."""
     game_mode = default_game_mode()
@@ -44,20 +67,9 @@ def main():
     network.set_random_vulnerabilities = True
     network.reset_random_vulnerabilities()
 
-    network_interface = NetworkInterface(game_mode=game_mode, network=network)
-
-    red = SineWaveRedAgent(network_interface)
-    blue = BlueInterface(network_interface)
-
-    env = GenericNetworkEnv(
-        red,
-        blue,
-        network_interface,
-        print_metrics=True,
-        show_metrics_every=10,
-        collect_additional_per_ts_data=True,
-        print_per_ts_data=False,
-    )
+    # training skips the per step metrics and data, they are only collected
+    # for the visualization after training
+    env = make_env(network, game_mode, collect_metrics=False)
 
     # get the current directory
     current_dir = os.getcwd()
@@ -71,18 +83,27 @@ def main():
     check_env(env, warn=True)
     # setup the monitor to check the training
     env = Monitor(env, model_name)
-    env.reset()
 
-    agent = PPO(PPOMlp, env, verbose=1, tensorboard_log=tensorboard_log_dir)
+    agent = PPO(PPOMlp,
+                env,
+                verbose=1,
+                tensorboard_log=tensorboard_log_dir,
+                device='cpu')
 
-    eval_callback = EvalCallback(Monitor(env),
+    # evaluate on a separate env so the training episodes stay untouched, it
+    # renders while evaluating and so stays a single env
+    eval_env = make_env(network, game_mode, collect_metrics=False)
+    eval_callback = EvalCallback(Monitor(eval_env),
                                  eval_freq=100,
                                  deterministic=False,
                                  render=True)
 
     agent.learn(total_timesteps=100000, callback=eval_callback)
 
-    loop = ActionLoop(env, agent, filename, episode_count=10)
+    loop = ActionLoop(make_env(network, game_mode),
+                      agent,
+                      filename,
+                      episode_count=10)
     loop.gif_action_loop(
         render_network=True,
         save_gif=True,
@@ -1,6 +1,7 @@
 import os
 import sys
 import time
+from pathlib import Path
 
 import networkx as nx
 from stable_baselines3 import PPO
@@ -13,8 +14,10 @@ from cyberattacksim.envs.generic.core.network_interface import NetworkInterface
 from cyberattacksim.envs.generic.core.red_interface import RedInterface
 from cyberattacksim.envs.generic.generic_env import GenericNetworkEnv
 from cyberattacksim.game_modes.game_mode_db import default_game_mode
-from cyberattacksim.utils.env_utils import (
-    get_network_from_edges_and_positions, read_nodes_edges_from_file)
+from cyberattacksim.utils import generate_test_networks as gtn
+from cyberattacksim.utils.env_utils import get_network_from_edges_and_positions
+
+LAYOUT_CACHE_DIR = Path.home() / '.cache' / 'cyberattacksim' / 'layouts'
 
 if __name__ == '__main__':
     # get the current directory
@@ -23,36 +26,24 @@ if __name__ == '__main__':
     log_dir = os.path.join(current_dir, 'work_dir', 'random_nodes_logs_dir')
     if not os.path.exists(log_dir):
         os.makedirs(log_dir)
-    edges_file = os.path.join(log_dir, 'random_nodes.edgelist')
 
     start_time = time.time()
-    G = nx.complete_graph(12)
-    G = nx.cycle_graph(24)
-    G = nx.wheel_graph(20)
-    G = nx.erdos_renyi_graph(100, 0.5)
     G = nx.karate_club_graph()
-    pos = nx.spring_layout(G, iterations=100, seed=42)
-    nx.write_edgelist(G, edges_file)
-    nodes, edges = read_nodes_edges_from_file(edges_file)
-    network = get_network_from_edges_and_positions(edges, pos)
+    pos = gtn.cached_spring_layout(G,
+                                   seed=42,
+                                   cache_dir=str(LAYOUT_CACHE_DIR),
+                                   iterations=100)
+    network = get_network_from_edges_and_positions(G.edges, pos)
     # network = create_star(first_layer_size=8, group_size=5, group_connectivity=0.5)
     end_time = time.time()
     print(f'Network Created: {end_time-start_time} seconds!!!')
     start_time = time.time()
     network.set_random_entry_nodes = True
     network.num_of_random_entry_nodes = 3
-    network.reset_random_entry_nodes()
-    end_time = time.time()
-    print(f'Network Reset: {end_time-start_time}')
-    start_time = time.time()
     network.set_random_high_value_nodes = True
     network.num_of_random_high_value_nodes = 3
-    network.reset_random_high_value_nodes()
-    end_time = time.time()
-    print(f'Network Reset: {end_time-start_time}')
-    start_time = time.time()
     network.set_random_vulnerabilities = True
-    network.reset_random_vulnerabilities()
+    network.reset()
     end_time = time.time()
     print(f'Network Reset: {end_time-start_time}')
     game_mode = default_game_mode()
@@ -60,7 +51,7 @@ if __name__ == '__main__':
     red = RedInterface(network_interface)
     blue = BlueInterface(network_interface)
     env = GenericNetworkEnv(red, blue, network_interface)
-    agent = PPO(PPOMlp, env, device='auto', verbose=1)
+    agent = PPO(PPOMlp, env, device='cpu', verbose=1)
     agent.learn(total_timesteps=1000)
     loop = ActionLoop(env, agent, episode_count=5)
     loop.gif_action_loop(
@@ -1,12 +1,14 @@
 import os
 import sys
+from copy import deepcopy
+from functools import partial
 
+import torch
 from stable_baselines3 import A2C, DQN, PPO
 from stable_baselines3.a2c import MlpPolicy as A2C_policy
 from stable_baselines3.common.callbacks import (
     EvalCallback, StopTrainingOnNoModelImprovement)
 from stable_baselines3.common.env_checker import check_env
-from stable_baselines3.common.monitor import Monitor
 from stable_baselines3.dqn import MlpPolicy as DQN_policy
 from stable_baselines3.ppo import MlpPolicy as PPO_policy
 
@@ -16,10 +18,35 @@ from cyberattacksim.envs.generic.core.blue_interface import BlueInterface
 from cyberattacksim.envs.generic.core.network_interface import NetworkInterface
 from cyberattacksim.envs.generic.core.red_interface import RedInterface
 from cyberattacksim.envs.generic.generic_env import GenericNetworkEnv
+from cyberattacksim.experiment_helpers.sb3 import (init_vec_env,
+                                                   resolve_vec_backend)
 from cyberattacksim.game_modes.game_mode_db import default_game_mode
 from cyberattacksim.networks.network_db import default_18_node_network
 
 
+def make_env(proto_network_interface: NetworkInterface,
+             collect_metrics: bool = True) -> GenericNetworkEnv:
+    """Build a GenericNetworkEnv on its own copy of a prototype network
+    interface, so several envs can be stepped side by side.
+
+    Copying an initialised interface is cheaper than initialising a new one
+    from the network and game mode.
+    """
+    network_interface = deepcopy(proto_network_interface)
+    red = RedInterface(network_interface)
+    blue = BlueInterface(network_interface)
+    env = GenericNetworkEnv(
+        red,
+        blue,
+        network_interface,
+        print_metrics=collect_metrics,
+        show_metrics_every=50,
+        collect_additional_per_ts_data=collect_metrics,
+        print_per_ts_data=False,
+    )
+    return env
+
+
 def main():
     # get the current directory
     current_dir = os.getcwd()
@@ -38,6 +65,11 @@ def main():
     ]
     # check with lower timesteps
     timesteps = 1000000
+    num_envs = min(8, os.cpu_count() or 1)
+    # the small MLP policies run on cpu, leave the remaining cores to the
+    # env worker processes instead of torch's intra-op threads
+    torch.set_num_threads(max(1, (os.cpu_count() or 1) // num_envs))
+    n_eval_envs = 4
     if not os.path.exists(log_dir):
         os.makedirs(log_dir)
 
@@ -45,6 +77,13 @@ def main():
     # check the network
     network.show(verbose=True)
     game_mode = default_game_mode()
+    # every env of every algorithm is a copy of this interface
+    proto_network_interface = NetworkInterface(game_mode=game_mode,
+                                               network=network)
+    # the training and evaluation envs of every algorithm are stepped by the
+    # same backend, so the env is timed only once
+    vec_backend = resolve_vec_backend(
+        partial(make_env, proto_network_interface, collect_metrics=False))
     # Loop over the algorithms
     for idx, algorithm in enumerate(algorithms):
         agent = agents[idx]
@@ -55,35 +94,34 @@ def main():
         media_dir = os.path.join(log_dir, algorithm, 'media')
 
         print(f'Starting the agent using {algorithm} algorithm')
-        # init the network
-        network_interface = NetworkInterface(game_mode=game_mode,
-                                             network=network)
-        red = RedInterface(network_interface)
-        blue = BlueInterface(network_interface)
-        env = GenericNetworkEnv(
-            red,
-            blue,
-            network_interface,
-            print_metrics=True,
-            show_metrics_every=50,
-            collect_additional_per_ts_data=True,
-            print_per_ts_data=False,
-        )
+        # init a single env to check and to visualize the model with
+        vis_env = make_env(proto_network_interface)
         # check the env
-        check_env(env, warn=True)
-        # reset the environment
-        env.reset()
-        # setup the monitor to check the training
-        env = Monitor(env, model_name)
+        check_env(vis_env, warn=True)
+        # separate envs for evaluation, stepped in parallel
+        eval_env = init_vec_env(partial(make_env,
+                                        proto_network_interface,
+                                        collect_metrics=False),
+                                n_envs=n_eval_envs,
+                                backend=vec_backend)
+        # setup the training envs, stepped in-process or in worker processes
+        # depending on the VEC_BACKEND environment variable
+        env = init_vec_env(partial(make_env,
+                                   proto_network_interface,
+                                   collect_metrics=False),
+                           n_envs=num_envs,
+                           monitor_path=model_name,
+                           backend=vec_backend)
         # define callback to stop the training
         stop_train_callback = StopTrainingOnNoModelImprovement(
             max_no_improvement_evals=3, min_evals=5, verbose=1)
         print(stop_train_callback)
 
         eval_callback = EvalCallback(
-            env,
-            n_eval_episodes=5,
-            eval_freq=100,  # eval_freq
+            eval_env,
+            n_eval_episodes=2 * n_eval_envs,
+            # counted in vectorized steps, i.e. num_envs timesteps each
+            eval_freq=max(100, 2048 // num_envs),
             log_path=model_dir,  # save the logs
             best_model_save_path=model_dir,  # save the model
             deterministic=False,
@@ -100,6 +138,7 @@ def main():
                 buffer_size=100000,
                 target_update_interval=1000,
                 tensorboard_log=tf_log_dir,
+                device='cpu',
             )
         else:
             chosen_agent = agent(
@@ -108,6 +147,7 @@ def main():
                 verbose=1,
                 normalize_advantage=True,
                 tensorboard_log=tf_log_dir,
+                device='cpu',
             )
 
         # Train the agent
@@ -120,8 +160,10 @@ def main():
         )
         # save the trained-converged model
         chosen_agent.save(model_name)
+        env.close()
+        eval_env.close()
         # visualize the trained-converged model
-        loop = ActionLoop(env, chosen_agent, episode_count=3)
+        loop = ActionLoop(vis_env, chosen_agent, episode_count=3)
         loop.gif_action_loop(
             save_gif=True,
             render_network=True,
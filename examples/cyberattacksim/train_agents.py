@@ -1,21 +1,11 @@
 """This code is an example for setting up the training of the various agents
 using the algorithms present and using the current version of YAWNING TITAN."""
 
-import glob
+import argparse
 import os
-
-import generate_test_networks as gtn
-import numpy as np
-# load the agents
-from stable_baselines3 import A2C, DQN, PPO
-# load the policies
-from stable_baselines3.a2c import MlpPolicy as A2C_policy
-from stable_baselines3.common.callbacks import (
-    EvalCallback, StopTrainingOnNoModelImprovement)
-from stable_baselines3.common.env_checker import check_env
-from stable_baselines3.common.monitor import Monitor
-from stable_baselines3.dqn import MlpPolicy as DQN_policy
-from stable_baselines3.ppo import MlpPolicy as PPO_policy
+import re
+from copy import deepcopy
+from functools import partial
 
 from cyberattacksim.envs.generic.core.blue_interface import BlueInterface
 from cyberattacksim.envs.generic.core.network_interface import NetworkInterface
@@ -23,10 +13,57 @@ from cyberattacksim.envs.generic.core.red_interface import RedInterface
 from cyberattacksim.envs.generic.generic_env import GenericNetworkEnv
 from cyberattacksim.game_modes.game_mode_db import default_game_mode
 from cyberattacksim.networks import network_creator
+from cyberattacksim.utils import generate_test_networks as gtn
 from cyberattacksim.utils.file_utils import make_dirs
 
 
+def make_env(proto_network_interface: NetworkInterface) -> GenericNetworkEnv:
+    """Build a GenericNetworkEnv on its own copy of a prototype network
+    interface, so several envs can be stepped side by side."""
+    network_interface = deepcopy(proto_network_interface)
+
+    # generate the red and blue agents
+    red = RedInterface(network_interface)
+    blue = BlueInterface(network_interface)
+
+    # generate the network environment
+    return GenericNetworkEnv(
+        red,
+        blue,
+        network_interface,
+        print_metrics=True,
+        show_metrics_every=100,
+        collect_additional_per_ts_data=True,
+        print_per_ts_data=False,
+    )
+
+
 def main():
+    parser = argparse.ArgumentParser(description='Train the agents')
+    parser.add_argument(
+        '--num_envs',
+        type=int,
+        default=4,
+        help='Number of envs stepped in parallel during training',
+    )
+    args = parser.parse_args()
+
+    # stable_baselines3 pulls in torch, so it is only imported once the
+    # script actually trains
+    # load the agents
+    from stable_baselines3 import A2C, DQN, PPO
+    # load the policies
+    from stable_baselines3.a2c import MlpPolicy as A2C_policy
+    from stable_baselines3.common.callbacks import (
+        EvalCallback, StopTrainingOnNoModelImprovement)
+    from stable_baselines3.common.env_checker import check_env
+    from stable_baselines3.common.monitor import Monitor
+    from stable_baselines3.dqn import MlpPolicy as DQN_policy
+    from stable_baselines3.ppo import MlpPolicy as PPO_policy
+
+    from cyberattacksim.experiment_helpers.sb3 import (init_vec_env,
+                                                       resolve_vec_backend)
+
     # get the current directory
     current_dir = os.getcwd()
     # directories
@@ -61,16 +98,30 @@ def main():
         os.path.join(work_dir,
                      str(n_node) + '_env') for n_node in standard_example
     ]
+    # the game mode is the same for every network size
+    game_mode = default_game_mode()
+    # index the saved networks by their size once
+    # the dense, CSR and older .npz saves of create_network, in order of
+    # preference when one size was saved in several formats
+    suffixes = ['.npy', gtn.CSR_SUFFIX, '.npz']
+    network_file_pattern = re.compile(r'synthetic_(\d+)(' +
+                                      '|'.join(map(re.escape, suffixes)) +
+                                      r')$')
+    files_by_size = {}
+    if os.path.isdir(network_dir):
+        for network_file in os.listdir(network_dir):
+            match = network_file_pattern.match(network_file)
+            if not match:
+                continue
+            size = int(match.group(1))
+            rank = suffixes.index(match.group(2))
+            if size not in files_by_size or rank < files_by_size[size][0]:
+                files_by_size[size] = (rank,
+                                       os.path.join(network_dir, network_file))
     # loop over the network size
     for index, isize in enumerate(standard_example):
-        network_load = glob.glob(
-            os.path.join(network_dir, f'synthetic_{isize}*.npz'))
-
-        if len(network_load) == 1:
-            network_files = np.load(network_load[0], allow_pickle=True)
-            matrix = network_files['matrix']
-            positions = dict(np.ndenumerate(network_files['connections']))[(
-            )]  # convert the positions nd array to dict
+        if isize in files_by_size:
+            matrix, positions = gtn.load_network(files_by_size[isize][1])
         else:
             matrix, positions = gtn.create_network(
                 n_nodes=isize,
@@ -92,54 +143,43 @@ def main():
         network.set_random_vulnerabilities = True
         network.reset_random_vulnerabilities()
         network.show(verbose=1)
-        game_mode = default_game_mode()
+        # every env of this network size is a copy of this interface, so the
+        # env only needs to be checked once per size
+        proto_network_interface = NetworkInterface(game_mode=game_mode,
+                                                   network=network)
+        check_env(make_env(proto_network_interface), warn=True)
+        # time the env once per size, rather than once per algorithm
+        vec_backend = resolve_vec_backend(
+            partial(make_env, proto_network_interface))
         # Loop over the algorithms
         for ialgorithm in range(len(algorithms)):
             agent = agents[ialgorithm]
-            policies = policies[ialgorithm]
-            model_dir = os.path.join(env_dir[ialgorithm],
-                                     algorithms[ialgorithm])
+            policy = policies[ialgorithm]
+            model_dir = os.path.join(env_dir[index], algorithms[ialgorithm])
             model_name = os.path.join(model_dir,
-                                      model_names[index] + f'_{isize}')
-            tf_log_dir = os.path.join(env_dir[ialgorithm],
-                                      algorithms[ialgorithm], 'tf_logs')
+                                      model_names[ialgorithm] + f'_{isize}')
+            tf_log_dir = os.path.join(env_dir[index], algorithms[ialgorithm],
+                                      'tf_logs')
             make_dirs(model_dir)
             print(
                 f'Starting the agent using {algorithms[ialgorithm]} algorithm')
 
             # here enters the random seed! - I must use them in the testing phase.
-            network_interface = NetworkInterface(game_mode=game_mode,
-                                                 network=network)
-
-            # generate the red and blue agents
-            red = RedInterface(network_interface)
-            blue = BlueInterface(network_interface)
-
-            # generate the network environment
-            env = GenericNetworkEnv(
-                red,
-                blue,
-                network_interface,
-                print_metrics=True,
-                show_metrics_every=100,
-                collect_additional_per_ts_data=True,
-                print_per_ts_data=False,
-            )
-
-            check_env(env, warn=True)
-            # reset the environment
-            env.reset()
-
-            # setup the monitor to check the training
-            env = Monitor(env, model_name)
+            # training steps num_envs copies of the env in parallel and the
+            # VecMonitor records their episodes
+            env = init_vec_env(partial(make_env, proto_network_interface),
+                               n_envs=args.num_envs,
+                               monitor_path=model_name,
+                               backend=vec_backend)
 
             # define callback to stop the training
             stop_train_callback = StopTrainingOnNoModelImprovement(
                 max_no_improvement_evals=3, min_evals=5, verbose=1)
             eval_callback = EvalCallback(
-                env,
+                Monitor(make_env(proto_network_interface)),
                 best_model_save_path=model_dir,  # save the model
-                eval_freq=1000,
+                # counted in vectorized steps, i.e. num_envs timesteps each
+                eval_freq=max(1, 1000 // args.num_envs),
                 log_path=model_dir,  # save the logs
                 callback_after_eval=stop_train_callback,
                 deterministic=False,
@@ -151,17 +191,25 @@ def main():
             if algorithms[ialgorithm] == 'DQN':
                 # adapt in case of buffer size
                 chosen_agent = agent(
-                    policies,
+                    policy,
                     env,
                     buffer_size=10000,
                     tensorboard_log=tf_log_dir,
                     verbose=1,
                 )
             else:
+                # keep the PPO rollout at 2048 timesteps across all envs
+                if algorithms[ialgorithm] == 'PPO':
+                    on_policy_kwargs = {
+                        'n_steps': max(1, 2048 // args.num_envs)
+                    }
+                else:
+                    on_policy_kwargs = {}
                 chosen_agent = agent(
-                    policies,
+                    policy,
                     env,
                     normalize_advantage=True,
+                    **on_policy_kwargs,
                     tensorboard_log=tf_log_dir,
                     verbose=1,
                 )
@@ -171,6 +219,7 @@ def main():
                                    callback=eval_callback)
             # save the trained-converged model
             chosen_agent.save(model_name)
+            env.close()
 
 
 if __name__ == '__main__':
@@ -2,12 +2,12 @@
 visualizing them."""
 
 import os
-import random
 import sys
 
 sys.path.append(os.getcwd())
 from importlib.resources import files
 
+import numpy as np
 from cyberwheel.network.network_base import Network
 from cyberwheel.network.network_generation.network_generator import \
     NetworkYAMLGenerator
@@ -17,6 +17,7 @@ def network_generator(
     num_subnets: int = 10,
     num_hosts_per_subnet: int = 100,
     base_name: str = 'host-network',
+    seed: int = None,
 ) -> None:
     """Generates a network configuration with routers, subnets, and hosts, then
     outputs the configuration as a YAML file and generates a network diagram.
@@ -25,6 +26,7 @@ def network_generator(
         num_subnets (int): The number of subnets to generate. Default is 10.
         num_hosts_per_subnet (int): The number of hosts per subnet. Default is 100.
         base_name (str): The base name for the network and output files. Default is '-host-network'.
+        seed (int): Seed for the random server types. Default is None.
     """
     # Calculate the total number of nodes in the network
     total_nodes = num_subnets * num_hosts_per_subnet
@@ -74,16 +76,18 @@ def network_generator(
         subnet_name = f'subnet{subnet_idx}'
         network.host(host_name, subnet_name, 'workstation')
 
-    # Add servers to the server subnets
+    # Add servers to the server subnets, drawing all their types at once
+    rng = np.random.default_rng(seed)
+    server_type_choices = rng.choice(server_types, size=20).tolist()
     for i in range(10):
         server_name = f'server{i}'
         server_subnet_name = 'server_subnet0'
-        server_type = random.choice(server_types)
+        server_type = server_type_choices[i]
         network.host(server_name, server_subnet_name, server_type)
 
         server_name2 = f'server{i+10}'
         server_subnet_name2 = 'server_subnet1'
-        server_type2 = random.choice(server_types)
+        server_type2 = server_type_choices[i + 10]
         network.host(server_name2, server_subnet_name2, server_type2)
 
     # Create interfaces between hosts and servers
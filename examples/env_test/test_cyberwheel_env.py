@@ -1,9 +1,15 @@
+import hashlib
 import os
+import pickle
 import sys
 from copy import deepcopy
+from functools import lru_cache
+from importlib.metadata import PackageNotFoundError, version
 from importlib.resources import files
+from pathlib import Path
 
 import gymnasium as gym
+import numpy as np
 
 sys.path.append(os.getcwd())
 from cyberwheel.cyberwheel_envs.cyberwheel_dynamic import DynamicCyberwheel
@@ -11,6 +17,50 @@ from cyberwheel.network.network_base import Network
 from cyberwheel.red_agents import ARTAgent
 from cyberwheel.red_agents.strategies import DFSImpact, ServerDowntime
 
+NETWORK_CACHE_DIR = Path.home() / '.cache' / 'cyberwheel'
+
+MASSIVE_NETWORK_CONFIGS = {
+    size: f'{size}-host-network.yaml'
+    for size in (10, 50, 200, 1000, 5000, 10000, 100000, 150000)
+}
+
+
+def _cyberwheel_version() -> str:
+    """The installed cyberwheel version, the pickled networks are instances
+    of its classes."""
+    try:
+        return version('cyberwheel')
+    except PackageNotFoundError:
+        return 'unknown'
+
+
+@lru_cache(maxsize=None)
+def _load_network(network_config: str, mtime: float, red_agent: str):
+    """Parse a network YAML and map its services, memoized per process on the
+    config path and modification time and pickled to disk keyed on the
+    config's content and the cyberwheel version."""
+    with open(network_config, 'rb') as f:
+        config_hash = hashlib.sha1(f.read()).hexdigest()
+    cache_id = f'{config_hash}:{_cyberwheel_version()}:{red_agent}'
+    key = hashlib.sha1(cache_id.encode()).hexdigest()
+    cache_file = NETWORK_CACHE_DIR / f'{key}.pkl'
+    if cache_file.exists():
+        with open(cache_file, 'rb') as f:
+            return pickle.load(f)
+
+    print(f'Building network: {network_config} ...')
+    network = Network.create_network_from_yaml(network_config)
+
+    print('Mapping attack validity to hosts...', end=' ')
+    service_mapping = {}
+    if red_agent == 'art_agent':
+        service_mapping = ARTAgent.get_service_map(network)
+
+    NETWORK_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    with open(cache_file, 'wb') as f:
+        pickle.dump((network, service_mapping), f, protocol=5)
+    return network, service_mapping
+
 
 def create_cyberwheel_env(
     network_config: str = '15-host-network.yaml',
@@ -31,13 +81,11 @@ def create_cyberwheel_env(
     # Load network from yaml here
     network_config = files('cyberwheel.resources.configs.network').joinpath(
         network_config)
-    print(f'Building network: {network_config} ...')
-    network = Network.create_network_from_yaml(network_config)
-
-    print('Mapping attack validity to hosts...', end=' ')
-    service_mapping = {}
-    if red_agent == 'art_agent':
-        service_mapping = ARTAgent.get_service_map(network)
+    network, service_mapping = _load_network(
+        str(network_config),
+        os.path.getmtime(network_config),
+        red_agent,
+    )
 
     if red_strategy == 'dfs_impact':
         red_strategy = DFSImpact
@@ -65,24 +113,10 @@ def create_cyberwheel_env(
 
 
 def create_massive_node_env(network_size: int = 10):
-    if network_size == 10:
-        network_config = '10-host-network.yaml'
-    if network_size == 50:
-        network_config = '50-host-network.yaml'
-    if network_size == 200:
-        network_config = '200-host-network.yaml'
-
-    if network_size == 1000:
-        network_config = '1000-host-network.yaml'
-    if network_size == 5000:
-        network_config = '5000-host-network.yaml'
-    if network_size == 10000:
-        network_config = '10000-host-network.yaml'
-
-    if network_size == 100000:
-        network_config = '100000-host-network.yaml'
-    if network_size == 150000:
-        network_config = '150000-host-network.yaml'
+    if network_size not in MASSIVE_NETWORK_CONFIGS:
+        raise ValueError(f'No network config for {network_size} hosts, '
+                         f'choose from {sorted(MASSIVE_NETWORK_CONFIGS)}')
+    network_config = MASSIVE_NETWORK_CONFIGS[network_size]
 
     env = create_cyberwheel_env(network_config)
 
@@ -96,9 +130,16 @@ if __name__ == '__main__':
     done = False
     steps = 0
     obs, _ = env.reset()
+    # sample the random actions in blocks instead of one call per step
+    rng = np.random.default_rng(42)
+    block_size = 1000
     while not done:
-        action = env.action_space.sample()
+        if steps % block_size == 0:
+            actions = rng.integers(0, env.action_space.n,
+                                   size=block_size).tolist()
+        action = actions[steps % block_size]
         obs, reward, done, truncated, info = env.step(action)
-        print(reward, done, truncated, info)
         steps += 1
+        if steps % 1000 == 0:
+            print(f'step {steps}: reward {reward}')
     print(f'Env finished after {steps} steps')
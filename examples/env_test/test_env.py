@@ -4,6 +4,7 @@ import time
 
 import gymnasium as gym
 import networkx as nx
+import numpy as np
 
 sys.path.append(os.getcwd())
 
@@ -15,7 +16,27 @@ from cyberattacksim.envs.generic.generic_env import GenericNetworkEnv
 from cyberattacksim.game_modes.game_mode_db import default_game_mode
 from cyberattacksim.networks.network import Network
 from cyberattacksim.utils.env_utils import (get_network_from_nodes_edges,
-                                            read_nodes_edges_from_file)
+                                            read_integer_edges)
+
+
+def analytic_nodes_edges(graph_name: str, num_nodes: int):
+    """Node and edge lists of graphs with a closed-form topology, built
+    without going through a networkx graph.
+
+    Returns ``None`` for graphs that have to be generated by networkx.
+    """
+    nodes = list(range(num_nodes))
+    if graph_name == 'path_graph':
+        edges = list(zip(range(num_nodes - 1), range(1, num_nodes)))
+    elif graph_name == 'wheel_graph':
+        # hub node 0 connected to every node of the rim 1..n-1
+        edges = [(0, i) for i in range(1, num_nodes)]
+        edges.extend(zip(range(1, num_nodes - 1), range(2, num_nodes)))
+        if num_nodes > 3:
+            edges.append((num_nodes - 1, 1))
+    else:
+        return None
+    return nodes, edges
 
 
 def creat_genetic_network(
@@ -24,21 +45,19 @@ def creat_genetic_network(
     data_dir: str = './data',
     seed: int = 42,
 ) -> None:
-    if graph_name == 'wheel_graph':
-        base_graph = nx.wheel_graph(10000)
-    elif graph_name == 'path_graph':
-        base_graph = nx.path_graph()
-    elif graph_name == 'complete_graph':
+    nodes_edges = analytic_nodes_edges(graph_name, num_nodes)
+    if nodes_edges is not None:
+        return get_network_from_nodes_edges(*nodes_edges)
+
+    if graph_name == 'complete_graph':
         base_graph = nx.complete_graph(num_nodes)
     elif graph_name == 'random_internet':
         base_graph = nx.random_internet_as_graph(num_nodes, seed=seed)
     else:
         raise ValueError('Invalid graph name')
 
-    file_path = os.path.join(data_dir, 'graph.edgelist')
-    nx.write_edgelist(base_graph, file_path)
-    nodes, edges = read_nodes_edges_from_file(file_path)
-    network = get_network_from_nodes_edges(nodes, edges)
+    network = get_network_from_nodes_edges(list(base_graph.nodes),
+                                           list(base_graph.edges))
     return network
 
 
@@ -73,21 +92,31 @@ def creat_massive_network(
     set_random_high_value_nodes: bool = True,
     num_of_random_high_value_nodes: int = 10,
     seed: int = 42,
+    dump_edgelist: bool = False,
 ) -> None:
-    if graph_name == 'wheel_graph':
-        base_graph = nx.wheel_graph(num_nodes)
-    elif graph_name == 'path_graph':
-        base_graph = nx.path_graph(num_nodes)
-    elif graph_name == 'complete_graph':
-        base_graph = nx.complete_graph(num_nodes)
-    elif graph_name == 'random_internet':
-        base_graph = nx.random_internet_as_graph(num_nodes, seed=seed)
+    nodes_edges = analytic_nodes_edges(graph_name, num_nodes)
+    if nodes_edges is not None and not dump_edgelist:
+        nodes, edges = nodes_edges
     else:
-        raise ValueError('Invalid graph name')
+        if graph_name == 'wheel_graph':
+            base_graph = nx.wheel_graph(num_nodes)
+        elif graph_name == 'path_graph':
+            base_graph = nx.path_graph(num_nodes)
+        elif graph_name == 'complete_graph':
+            base_graph = nx.complete_graph(num_nodes)
+        elif graph_name == 'random_internet':
+            base_graph = nx.random_internet_as_graph(num_nodes, seed=seed)
+        else:
+            raise ValueError('Invalid graph name')
 
-    file_path = os.path.join(data_dir, 'graph.edgelist')
-    nx.write_edgelist(base_graph, file_path)
-    nodes, edges = read_nodes_edges_from_file(file_path)
+        if dump_edgelist:
+            # keep a copy of the graph on disk and build the network from
+            # it, the generated graphs name their nodes by integers
+            edgelist_file = os.path.join(data_dir, 'graph.edgelist')
+            nx.write_edgelist(base_graph, edgelist_file)
+            nodes, edges = read_integer_edges(edgelist_file)
+        else:
+            nodes, edges = list(base_graph.nodes), list(base_graph.edges)
     network = get_network_from_nodes_edges(
         nodes,
         edges,
@@ -133,12 +162,18 @@ if __name__ == '__main__':
     done = False
     steps = 0
     obs, _ = env.reset()
+    # sample the random actions in blocks instead of one call per step
+    rng = np.random.default_rng(42)
+    block_size = 1000
     start_time = time.time()
     while not done:
-        action = env.action_space.sample()
+        if steps % block_size == 0:
+            actions = rng.integers(0, env.action_space.n,
+                                   size=block_size).tolist()
+        action = actions[steps % block_size]
         obs, reward, done, truncated, info = env.step(action)
-        print(obs)
-        print(reward, done, truncated)
         steps += 1
+        if steps % 1000 == 0:
+            print(f'step {steps}: reward {reward}')
     end_time = time.time()
     print(f'Env finished after {steps} steps, time: {end_time - start_time}')
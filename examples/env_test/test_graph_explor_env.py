@@ -2,6 +2,8 @@ import os
 import sys
 import time
 
+import numpy as np
+
 sys.path.append(os.getcwd())
 
 from cyberattacksim.envs.specific.graph_explore import GraphExplore
@@ -13,12 +15,17 @@ if __name__ == '__main__':
     _ = env.reset()
     done = False
     steps = 0
+    # an episode lasts at most game_max steps, sample all actions up front
+    rng = np.random.default_rng(42)
+    actions = rng.integers(0, env.action_space.n,
+                           size=env.GAME_MAX + 1).tolist()
     start_time = time.time()
     while not done:
-        action = env.action_space.sample()
+        action = actions[steps]
         obs, reward, done, truncated, info = env.step(action)
-        print('reward:', reward)
         steps += 1
+        if steps % 1000 == 0:
+            print(f'step {steps}: reward {reward}')
     end_time = time.time()
     print(
         f'Episode finished after {steps} steps. Time taken: {end_time - start_time} seconds'
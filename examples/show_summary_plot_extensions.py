@@ -4,9 +4,16 @@ exploration."""
 import glob
 import os
 import sys
+from concurrent.futures import ProcessPoolExecutor
 
-import matplotlib.pyplot as plt
-import pandas as pd
+import matplotlib
+
+# render off-screen unless the figure is shown interactively
+if not os.environ.get('INTERACTIVE'):
+    matplotlib.use('Agg')
+import matplotlib.pyplot as plt  # noqa: E402
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
 
 sys.path.append(os.getcwd())
 from cyberattacksim.utils.df_utils import get_summary_statistics, process_df
@@ -14,6 +21,13 @@ from cyberattacksim.utils.plotting_utils import \
     plot_multi_extension_comparison_size
 
 
+def summarise_file(path: str) -> pd.DataFrame:
+    data = pd.read_csv(path, header=0, engine='c')  # load the data
+    cleaned = process_df(data)  # clean the df
+    new_df = cleaned.drop(columns='model').copy()  # process the df
+    return get_summary_statistics(new_df)
+
+
 def main():
     # staging
     current_dir = os.getcwd()
@@ -58,26 +72,23 @@ def main():
     algorithm_order = ['std', 'df075', 'lr001']
 
     # generate the location for the datapoints
-    xlocs = [i * 3 + 1 for i in range(24)]
-    xlow, xmid, xhigh = [], [], []
-    for i in xlocs:
-        xlow.append(i - 0.3)
-        xmid.append(i - 0.0)
-        xhigh.append(i + 0.3)
+    xmid = np.arange(1, 73, 3, dtype=float)
+    xlow, xhigh = xmid - 0.3, xmid + 0.3
 
     # create the full summary to pass
     full_summary = {}
 
+    # summarise every data file that belongs to an item once, the files
+    # are independent so they are processed in parallel
+    item_files = [i for i in all_files if any(item in i for item in order)]
+    with ProcessPoolExecutor() as executor:
+        file_summaries = dict(
+            zip(item_files, executor.map(summarise_file, item_files)))
+
     for item in order:  # loop on the various items
-        for index, i in enumerate(all_files):  # loop in the data
+        for i in item_files:  # loop in the data
             if item in i:
-                data = pd.read_csv(i, header=0)  # load the data
-
-                cleaned = process_df(data)  # clean the df
-                new_df = cleaned.drop(columns='model').copy()  # process the df
-
-                sum_stat = get_summary_statistics(new_df)
-                full_summary[item] = sum_stat
+                full_summary[item] = file_summaries[i]
 
     # Call the plotter
     plot_multi_extension_comparison_size(
@@ -94,8 +105,9 @@ def main():
 
     plt.tight_layout()
     plt.subplots_adjust(wspace=0, hspace=0)
-    plt.show()
-    plt.savefig(figure_name)
+    plt.savefig(figure_name, dpi=150, bbox_inches='tight')
+    if os.environ.get('INTERACTIVE'):
+        plt.show()
 
 
 if __name__ == '__main__':
@@ -1,10 +1,13 @@
 # temp this will cover the various training performances of the various trained models
 
-import glob
 import os
 import sys
 
-import pandas as pd
+import matplotlib
+
+matplotlib.use('Agg')  # the figures are only saved to disk
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
 
 sys.path.append(os.getcwd())
 from cyberattacksim.utils.file_utils import make_dirs
@@ -25,27 +28,31 @@ def main() -> None:
     # Plotting colors
     colors = ['blue', 'green', 'orange']
 
+    # read every monitor file once up front, keyed by (algo, size, pars)
+    monitor_files = {}
+    for model_name, model_path in zip(models_names, models_paths):
+        for isize in network_size:
+            for itype in model_pars:
+                suffix = '' if itype == model_pars[0] else f'_{itype}'
+                monitor_files[model_name, isize, itype] = os.path.join(
+                    model_path,
+                    f'{model_name}_{isize}_nodes{suffix}.monitor.csv')
+    monitors = {
+        key: pd.read_csv(path,
+                         skiprows=2,
+                         names=['Reward', 'Lenght', 'Time'],
+                         dtype=np.float32,
+                         engine='c')
+        for key, path in monitor_files.items()
+    }
+
     # I should loop in a different way - No hyper pars, LR an DF, then size and loop over the various
     for itype in model_pars:
         for isize in network_size:
-            monitor_data = []
-            for index_algo in range(len(models_paths)):
-                if itype == model_pars[0]:
-                    lookUp_data = (
-                        models_paths[index_algo] +
-                        f'/{models_names[index_algo]}_{isize}_nodes.monitor.csv'
-                    )
-                else:
-                    lookUp_data = (
-                        models_paths[index_algo] +
-                        f'/{models_names[index_algo]}_{isize}_nodes_{itype}.monitor.csv'
-                    )
-                data = glob.glob(lookUp_data)[0]
-                # append everything into a list
-                monitor_data.append(
-                    pd.read_csv(data,
-                                skiprows=2,
-                                names=['Reward', 'Lenght', 'Time']))
+            monitor_data = [
+                monitors[model_name, isize, itype]
+                for model_name in models_names
+            ]
 
             plot_training_performance(
                 monitor_data,
@@ -12,6 +12,8 @@ from cyberattacksim.utils.env_utils import (
 if __name__ == '__main__':
     db = NetworkDB()
     db.rebuild_db()
+    # (network, name, description, author, locked), upserted in one write
+    entries = []
 
     # creat randomly connected graph
     description = 'A randomly connected graph. With the guarantee that each node will have at least one connection.'
@@ -30,11 +32,7 @@ if __name__ == '__main__':
         network.set_random_vulnerabilities = True
         network.reset_random_vulnerabilities()
         name = base_name + ':' + str(n_nodes) + '-nodes'
-        db.upsert(network,
-                  name=name,
-                  description=description,
-                  author=author,
-                  locked=True)
+        entries.append((network, name, description, author, True))
 
     # creat star graph
     description = 'This is one node in the middle with groups of nodes around it. \
@@ -55,11 +53,7 @@ if __name__ == '__main__':
     network.set_random_vulnerabilities = True
     network.reset_random_vulnerabilities()
     name = base_name
-    db.upsert(network,
-              name=name,
-              description=description,
-              author=author,
-              locked=True)
+    entries.append((network, name, description, author, True))
 
     # creat star graph
     description = 'Corporate Network'
@@ -67,11 +61,7 @@ if __name__ == '__main__':
     base_name = 'Corporate Network'
     network = network_creator.create_corporate_network()
     name = base_name
-    db.upsert(network,
-              name=name,
-              description=description,
-              author=author,
-              locked=True)
+    entries.append((network, name, description, author, True))
 
     # Craete Real Network
     current_dir = os.getcwd()
@@ -100,8 +90,6 @@ if __name__ == '__main__':
     author = 'Robion/CyberAttack'
     base_name = 'Karate Club Network'
     name = base_name
-    db.upsert(network,
-              name=name,
-              description=description,
-              author=author,
-              locked=True)
+    entries.append((network, name, description, author, True))
+
+    db.upsert_many(entries)